@@ -3,12 +3,13 @@ Channel configuration for Ethiopian Medical Business Data Platform.
 Defines the channels to be scraped with their specific settings and metadata.
 """
 
-from typing import Dict, List, Any
+from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cache
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ChannelConfig:
     """Configuration for a single Telegram channel."""
     
@@ -20,13 +21,9 @@ class ChannelConfig:
     enabled: bool = True
     scraping_limit: int = 1000
     scraping_interval_hours: int = 24
-    keywords: List[str] = None
+    keywords: Tuple[str, ...] = ()
     image_download: bool = True
     document_download: bool = True
-    
-    def __post_init__(self):
-        if self.keywords is None:
-            self.keywords = []
 
 
 # Ethiopian Medical Business Channels Configuration
@@ -37,7 +34,7 @@ ETHIOPIAN_MEDICAL_CHANNELS = [
         description="Official channel for Chemed medical products and services",
         category="pharmaceutical",
         priority=1,
-        keywords=["medicine", "pharmaceutical", "health", "medical", "drugs", "treatment"],
+        keywords=("medicine", "pharmaceutical", "health", "medical", "drugs", "treatment"),
         scraping_limit=2000,
         scraping_interval_hours=12
     ),
@@ -48,7 +45,7 @@ ETHIOPIAN_MEDICAL_CHANNELS = [
         description="Cosmetics and beauty products channel",
         category="cosmetics",
         priority=2,
-        keywords=["cosmetics", "beauty", "skincare", "makeup", "personal_care"],
+        keywords=("cosmetics", "beauty", "skincare", "makeup", "personal_care"),
         scraping_limit=1500,
         scraping_interval_hours=24
     ),
@@ -59,7 +56,7 @@ ETHIOPIAN_MEDICAL_CHANNELS = [
         description="Tikvah pharmaceutical products and services",
         category="pharmaceutical",
         priority=1,
-        keywords=["pharma", "medicine", "healthcare", "medical", "drugs", "treatment"],
+        keywords=("pharma", "medicine", "healthcare", "medical", "drugs", "treatment"),
         scraping_limit=2000,
         scraping_interval_hours=12
     )
@@ -73,7 +70,7 @@ ADDITIONAL_CHANNELS = [
     #     description="Official channel of Ethiopian Pharmaceutical Association",
     #     category="association",
     #     priority=3,
-    #     keywords=["pharmaceutical", "association", "regulation", "health_policy"],
+    #     keywords=("pharmaceutical", "association", "regulation", "health_policy"),
     #     scraping_limit=1000,
     #     scraping_interval_hours=48
     # ),
@@ -84,52 +81,62 @@ ADDITIONAL_CHANNELS = [
     #     description="Medical supplies and equipment in Addis Ababa",
     #     category="medical_supplies",
     #     priority=2,
-    #     keywords=["medical_supplies", "equipment", "hospital", "clinic", "healthcare"],
+    #     keywords=("medical_supplies", "equipment", "hospital", "clinic", "healthcare"),
     #     scraping_limit=1500,
     #     scraping_interval_hours=24
     # ),
 ]
 
 
-def get_enabled_channels() -> List[ChannelConfig]:
+# O(1) lookup table for get_channel_by_username (includes disabled channels)
+_CHANNELS_BY_USERNAME = {channel.username: channel for channel in ETHIOPIAN_MEDICAL_CHANNELS}
+
+
+# The channel list is static, so the list getters below are memoized and return
+# tuples, which callers cannot mutate. The dict getters build a fresh dict per
+# call instead: that is cheaper than copying a cached one.
+@cache
+def get_enabled_channels() -> Tuple[ChannelConfig, ...]:
     """Get all enabled channels."""
-    return [channel for channel in ETHIOPIAN_MEDICAL_CHANNELS if channel.enabled]
+    return tuple(channel for channel in ETHIOPIAN_MEDICAL_CHANNELS if channel.enabled)
 
 
-def get_channels_by_category(category: str) -> List[ChannelConfig]:
+@cache
+def get_channels_by_category(category: str) -> Tuple[ChannelConfig, ...]:
     """Get channels filtered by category."""
-    return [channel for channel in get_enabled_channels() if channel.category == category]
+    return tuple(channel for channel in get_enabled_channels() if channel.category == category)
 
 
-def get_channels_by_priority(min_priority: int = 1) -> List[ChannelConfig]:
+@cache
+def get_channels_by_priority(min_priority: int = 1) -> Tuple[ChannelConfig, ...]:
     """Get channels filtered by minimum priority."""
-    return [channel for channel in get_enabled_channels() if channel.priority <= min_priority]
+    return tuple(channel for channel in get_enabled_channels() if channel.priority <= min_priority)
 
 
-def get_channel_by_username(username: str) -> ChannelConfig:
+def get_channel_by_username(username: str) -> Optional[ChannelConfig]:
     """Get a specific channel by username."""
-    for channel in ETHIOPIAN_MEDICAL_CHANNELS:
-        if channel.username == username:
-            return channel
-    return None
+    return _CHANNELS_BY_USERNAME.get(username)
 
 
-def get_channel_usernames() -> List[str]:
+@cache
+def get_channel_usernames() -> Tuple[str, ...]:
     """Get list of all channel usernames."""
-    return [channel.username for channel in get_enabled_channels()]
+    return tuple(channel.username for channel in get_enabled_channels())
 
 
-def get_channels_for_image_analysis() -> List[ChannelConfig]:
+@cache
+def get_channels_for_image_analysis() -> Tuple[ChannelConfig, ...]:
     """Get channels that should have images downloaded for analysis."""
-    return [channel for channel in get_enabled_channels() if channel.image_download]
+    return tuple(channel for channel in get_enabled_channels() if channel.image_download)
 
 
-def get_channels_for_document_analysis() -> List[ChannelConfig]:
+@cache
+def get_channels_for_document_analysis() -> Tuple[ChannelConfig, ...]:
     """Get channels that should have documents downloaded for analysis."""
-    return [channel for channel in get_enabled_channels() if channel.document_download]
+    return tuple(channel for channel in get_enabled_channels() if channel.document_download)
 
 
-def get_scraping_schedule() -> Dict[str, Any]:
+def get_scraping_schedule() -> Dict[str, Dict[str, Any]]:
     """Get the scraping schedule based on channel configurations."""
     schedule = {}
     
@@ -4,32 +4,199 @@ Handles storage, organization, and validation of scraped Telegram data.
 """
 
 import json
+import os
 import shutil
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cache
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Union
 import hashlib
+import heapq
 import gzip
+import math
+import zlib
+from itertools import islice
+from operator import itemgetter
 
-from app.utils.logging.logger import telegram_logger
+import orjson
+
+from app.utils.logging.logger import get_telegram_logger, log_scraping_operation
 from config import settings
 
 
+# Matches legacy JSON arrays (.json, .json.gz) and NDJSON shards (.ndjson.gz)
+MESSAGE_FILE_GLOB = "messages_*.*json*"
+
+# Fields every stored message must carry
+REQUIRED_MESSAGE_FIELDS = frozenset({"message_id", "channel_username", "date", "text"})
+
+# Sort key for ISO-formatted message dates
+MESSAGE_DATE_KEY = itemgetter('date')
+
+# Buffer compressed shard writes so the gzip stream is flushed in large chunks
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Message files are small, so reads are latency-bound and overlap well on threads
+READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Reads queued per read worker; bounds the decompressed bytes held ahead of parsing
+READ_AHEAD_PER_WORKER = 2
+
+# Header bytes opening every gzip member (magic number plus the deflate method)
+GZIP_MEMBER_HEADER = b"\x1f\x8b\x08"
+
+# Message hashes tracked exactly in a set before duplicate detection switches to
+# a Bloom filter (~100 bytes per hash in the set, ~4 in the filter)
+BLOOM_EXACT_LIMIT = 200_000
+
+
+class _BloomLayer:
+    """A single fixed-capacity Bloom filter backed by a bytearray."""
+    
+    __slots__ = ("bits", "num_bits", "num_hashes", "capacity", "count")
+    
+    def __init__(self, capacity: int, error_rate: float):
+        self.num_bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.capacity = capacity
+        self.count = 0
+    
+    # Probes use enhanced double hashing, h1 + i*h2 + (i^3 - i)/6, computed
+    # incrementally: plain h1 + i*h2 probes form an arithmetic progression, so
+    # digests with the same step would overlap almost entirely. The loops are
+    # inlined in both methods, as this is the hot path of duplicate detection.
+    
+    def contains(self, h1: int, h2: int) -> bool:
+        """Check whether every bit for a digest is set."""
+        bits = self.bits
+        num_bits = self.num_bits
+        pos = h1 % num_bits
+        step = h2 % num_bits
+        for i in range(1, self.num_hashes + 1):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+            pos = (pos + step) % num_bits
+            step = (step + i) % num_bits
+        return True
+    
+    def add(self, h1: int, h2: int):
+        """Set every bit for a digest."""
+        bits = self.bits
+        num_bits = self.num_bits
+        pos = h1 % num_bits
+        step = h2 % num_bits
+        for i in range(1, self.num_hashes + 1):
+            bits[pos >> 3] |= 1 << (pos & 7)
+            pos = (pos + step) % num_bits
+            step = (step + i) % num_bits
+        self.count += 1
+
+
+class _ScalableBloomFilter:
+    """
+    Scalable Bloom filter for message hashes.
+    
+    Up to exact_limit hashes are kept in a plain set, which is both exact and
+    faster for the typical channel; past that they move into Bloom layers.
+    Message hashes are already uniformly distributed hex digests, so probe
+    positions are taken straight from the digest bytes instead of rehashing.
+    A new, larger layer with a tighter error rate is added whenever the
+    current one fills up, keeping the overall false-positive rate bounded.
+    """
+    
+    def __init__(
+        self, 
+        initial_capacity: int = 100_000, 
+        error_rate: float = 1e-6, 
+        exact_limit: int = BLOOM_EXACT_LIMIT
+    ):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.exact_limit = exact_limit
+        self.exact: Optional[set] = set()
+        self.layers: List[_BloomLayer] = []
+    
+    def add(self, message_hash: str) -> bool:
+        """Add a hash, returning True if it was (probably) already present."""
+        exact = self.exact
+        if exact is not None:
+            if message_hash in exact:
+                return True
+            exact.add(message_hash)
+            if len(exact) > self.exact_limit:
+                self._switch_to_layers()
+            return False
+        
+        try:
+            digest = bytes.fromhex(message_hash)
+        except ValueError:
+            digest = hashlib.blake2b(message_hash.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        
+        for layer in self.layers:
+            if layer.contains(h1, h2):
+                return True
+        
+        layer = self.layers[-1]
+        if layer.count >= layer.capacity:
+            depth = len(self.layers)
+            layer = _BloomLayer(
+                layer.capacity * 2,
+                self.error_rate / 2 ** (depth + 1)
+            )
+            self.layers.append(layer)
+        layer.add(h1, h2)
+        return False
+    
+    def _switch_to_layers(self):
+        """Move the exact set's hashes into a first Bloom layer with room to grow."""
+        exact = self.exact
+        self.exact = None
+        self.layers.append(_BloomLayer(max(self.initial_capacity, 2 * len(exact)), self.error_rate / 2))
+        for message_hash in exact:
+            self.add(message_hash)
+
+
 class DataLakeManager:
     """Manages the data lake structure and operations."""
     
-    def __init__(self):
-        self.data_dir = Path(settings.storage.data_dir)
+    def __init__(self, data_dir: Optional[Path] = None):
+        # Root of the data lake; defaults to the configured storage directory
+        self.data_dir = Path(data_dir or settings.storage.data_dir)
         self.raw_dir = self.data_dir / "raw"
         self.processed_dir = self.data_dir / "processed"
+        self.messages_dir = self.raw_dir / "telegram_messages"
         
-        # Create directory structure
-        self._create_directory_structure()
+        # Per-partition (dir_mtime_ns, message_count, size_bytes) for get_data_lake_stats;
+        # loaded on its first call
+        self.stats_cache_file = self.data_dir / ".stats_cache.json"
+        self._partition_cache: Optional[Dict[str, Tuple[int, int, int]]] = None
+        
+        # Indexed manifest of message files, so lookups by channel skip globbing;
+        # opened on first use
+        self.manifest_file = self.data_dir / "manifest.db"
+        self._manifest_lock = threading.Lock()
+        self._manifest: Optional[sqlite3.Connection] = None
+        
+        # Directory structure is created on first write, not on construction
+        self._initialized = False
+    
+    def _ensure_directory_structure(self):
+        """Create the data lake directory structure once, on first use."""
+        if not self._initialized:
+            self._create_directory_structure()
+            self._initialized = True
     
     def _create_directory_structure(self):
         """Create the data lake directory structure."""
         directories = [
-            self.raw_dir / "telegram_messages",
+            self.messages_dir,
             self.raw_dir / "telegram_images",
             self.raw_dir / "telegram_documents",
             self.processed_dir / "cleaned_messages",
@@ -40,6 +207,110 @@ class DataLakeManager:
         for directory in directories:
             directory.mkdir(parents=True, exist_ok=True)
     
+    def _open_manifest(self) -> sqlite3.Connection:
+        """Open the file manifest, indexing any existing partitions on first creation."""
+        is_new = not self.manifest_file.exists()
+        
+        manifest = sqlite3.connect(self.manifest_file, check_same_thread=False)
+        manifest.execute("PRAGMA journal_mode=WAL")
+        manifest.execute("PRAGMA synchronous=NORMAL")
+        with manifest:
+            manifest.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "channel TEXT NOT NULL, date TEXT NOT NULL, "
+                "path TEXT PRIMARY KEY, msg_count INTEGER)"
+            )
+            manifest.execute(
+                "CREATE INDEX IF NOT EXISTS idx_files_channel_date ON files (channel, date)"
+            )
+            
+            if is_new:
+                manifest.executemany(
+                    "INSERT OR IGNORE INTO files (channel, date, path) VALUES (?, ?, ?)",
+                    (
+                        (file_path.parent.name, file_path.parent.parent.name, str(file_path))
+                        for file_path in self.messages_dir.glob(f"*/*/{MESSAGE_FILE_GLOB}")
+                    )
+                )
+        
+        return manifest
+    
+    def _get_manifest(self) -> sqlite3.Connection:
+        """Return the manifest connection, opening it on first use (hold _manifest_lock)."""
+        if self._manifest is None:
+            self._ensure_directory_structure()
+            self._manifest = self._open_manifest()
+        return self._manifest
+    
+    def register_file(
+        self, 
+        channel: str, 
+        date_str: str, 
+        file_path: Path, 
+        message_count: int
+    ):
+        """Record a message file written to the data lake in the manifest."""
+        self._register_files([(channel, date_str, file_path, message_count)])
+    
+    def _register_files(self, files: List[Tuple[str, str, Path, int]]):
+        """Record (channel, date_str, file_path, message_count) rows in one manifest transaction."""
+        # Appending to an existing file leaves the directory mtime untouched, so
+        # bump it to keep the partition stats cache from serving a stale count
+        for _, _, file_path, _ in files:
+            os.utime(Path(file_path).parent)
+        
+        with self._manifest_lock:
+            manifest = self._get_manifest()
+            with manifest:
+                # Rows indexed when the manifest was created have no count yet
+                manifest.executemany(
+                    "INSERT INTO files (channel, date, path, msg_count) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (path) DO UPDATE SET msg_count = COALESCE(msg_count, 0) + excluded.msg_count",
+                    (
+                        (channel, date_str, str(file_path), message_count)
+                        for channel, date_str, file_path, message_count in files
+                    )
+                )
+    
+    def rebuild_manifest(self):
+        """
+        Bring the manifest in line with the message files on disk.
+        
+        Files copied into the lake (or written by older code) never went
+        through _register_files, and removed files leave rows behind. This
+        scans every partition, so run it after such changes rather than on
+        every lookup; a missing manifest is rebuilt automatically.
+        """
+        on_disk = {
+            str(file_path): (file_path.parent.name, file_path.parent.parent.name)
+            for file_path in self.messages_dir.glob(f"*/*/{MESSAGE_FILE_GLOB}")
+        }
+        
+        with self._manifest_lock:
+            manifest = self._get_manifest()
+            indexed = {path for (path,) in manifest.execute("SELECT path FROM files")}
+            with manifest:
+                manifest.executemany(
+                    "INSERT OR IGNORE INTO files (channel, date, path) VALUES (?, ?, ?)",
+                    (
+                        (channel, date_str, path)
+                        for path, (channel, date_str) in on_disk.items()
+                        if path not in indexed
+                    )
+                )
+                manifest.executemany(
+                    "DELETE FROM files WHERE path = ?",
+                    ((path,) for path in indexed - on_disk.keys())
+                )
+    
+    def _get_channel_files(self, channel: str) -> Tuple[List[Path], int]:
+        """Look up a channel's message files, and their recorded message total, from the manifest."""
+        with self._manifest_lock:
+            rows = self._get_manifest().execute(
+                "SELECT path, msg_count FROM files WHERE channel = ? ORDER BY date, path", (channel,)
+            ).fetchall()
+        return [Path(path) for path, _ in rows], sum(msg_count or 0 for _, msg_count in rows)
+    
     def save_messages(
         self, 
         channel: str, 
@@ -49,52 +320,90 @@ class DataLakeManager:
         """
         Save messages to the data lake with proper partitioning.
         
+        The message dictionaries are enriched in place with a "_metadata" key
+        rather than copied, so callers hand ownership of them to this method.
+        
         Args:
             channel: Channel username
-            messages: List of message dictionaries
+            messages: List of message dictionaries (mutated in place)
             date: Date for partitioning (defaults to today)
         
         Returns:
             Path to the saved file
         """
+        return self.save_messages_batch({channel: messages}, date)[channel]
+    
+    def save_messages_batch(
+        self, 
+        channel_messages: Dict[str, List[Dict[str, Any]]], 
+        date: Optional[datetime] = None
+    ) -> Dict[str, str]:
+        """
+        Save messages for several channels in one call.
+        
+        Each channel gets its own shard, partitioned as in save_messages, but
+        all shards share one timestamp and are recorded in the manifest in a
+        single transaction.
+        
+        Args:
+            channel_messages: Message dictionaries by channel username (mutated in place)
+            date: Date for partitioning (defaults to today)
+        
+        Returns:
+            Path to each channel's saved file, by channel username
+        """
         if not date:
             date = datetime.now()
         
-        # Create partitioned directory structure
-        date_str = date.strftime("%Y-%m-%d")
-        channel_dir = self.raw_dir / "telegram_messages" / date_str / channel
-        channel_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_directory_structure()
         
-        # Generate filename with timestamp and message count
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"messages_{timestamp}_{len(messages)}.json"
-        file_path = channel_dir / filename
-        
-        # Add metadata to messages
-        enriched_messages = []
-        for message in messages:
-            enriched_message = message.copy()
-            enriched_message["_metadata"] = {
-                "scraped_at": datetime.now().isoformat(),
-                "channel": channel,
-                "partition_date": date_str,
-                "file_path": str(file_path),
-                "message_hash": self._generate_message_hash(message)
-            }
-            enriched_messages.append(enriched_message)
+        date_str = date.date().isoformat()
+        now = datetime.now()
+        # Batches saved within the same second append to the same shard
+        filename = f"messages_{now.strftime('%Y%m%d_%H%M%S')}.ndjson.gz"
+        scraped_at = now.isoformat()
+        
+        saved = []
+        for channel, messages in channel_messages.items():
+            # Create partitioned directory structure
+            channel_dir = self.messages_dir / date_str / channel
+            channel_dir.mkdir(parents=True, exist_ok=True)
+            
+            file_path = channel_dir / filename
+            self._write_shard(channel, messages, date_str, file_path, scraped_at)
+            saved.append((channel, date_str, file_path, len(messages)))
         
-        # Save with compression
-        compressed_path = file_path.with_suffix('.json.gz')
-        with gzip.open(compressed_path, 'wt', encoding='utf-8') as f:
-            json.dump(enriched_messages, f, indent=2, ensure_ascii=False)
+        self._register_files(saved)
         
-        # Also save uncompressed version for easy access
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(enriched_messages, f, indent=2, ensure_ascii=False)
+        telegram_logger = get_telegram_logger()
+        for channel, _, file_path, message_count in saved:
+            telegram_logger.log_data_saved(channel, str(file_path), message_count)
         
-        telegram_logger.log_data_saved(channel, str(file_path), len(messages))
+        return {channel: str(file_path) for channel, _, file_path, _ in saved}
+    
+    def _write_shard(
+        self, 
+        channel: str, 
+        messages: List[Dict[str, Any]], 
+        date_str: str, 
+        file_path: Path, 
+        scraped_at: str
+    ):
+        """Append a channel's messages to a shard, attaching their metadata."""
+        file_path_str = str(file_path)
         
-        return str(file_path)
+        # Stream each message out as one NDJSON line with its metadata attached
+        with open(file_path, 'ab', buffering=WRITE_BUFFER_SIZE) as raw, \
+                gzip.GzipFile(fileobj=raw, mode='ab') as f:
+            for message in messages:
+                message["_metadata"] = {
+                    "scraped_at": scraped_at,
+                    "channel": channel,
+                    "partition_date": date_str,
+                    "file_path": file_path_str,
+                    "message_hash": self._generate_message_hash(message)
+                }
+                f.write(orjson.dumps(message, option=orjson.OPT_APPEND_NEWLINE))
     
     def save_channel_metadata(
         self, 
@@ -106,8 +415,10 @@ class DataLakeManager:
         if not date:
             date = datetime.now()
         
-        date_str = date.strftime("%Y-%m-%d")
-        channel_dir = self.raw_dir / "telegram_messages" / date_str / channel
+        self._ensure_directory_structure()
+        
+        date_str = date.date().isoformat()
+        channel_dir = self.messages_dir / date_str / channel
         channel_dir.mkdir(parents=True, exist_ok=True)
         
         metadata_file = channel_dir / "channel_metadata.json"
@@ -120,8 +431,8 @@ class DataLakeManager:
             "partition_date": date_str
         }
         
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(enriched_metadata, f, indent=2, ensure_ascii=False)
+        with open(metadata_file, 'wb') as f:
+            f.write(orjson.dumps(enriched_metadata, option=orjson.OPT_INDENT_2))
         
         return str(metadata_file)
     
@@ -132,25 +443,26 @@ class DataLakeManager:
         end_date: datetime
     ) -> List[Dict[str, Any]]:
         """Retrieve messages for a specific date range."""
-        messages = []
-        current_date = start_date
+        paths = []
+        start_day = start_date.date()
         
-        while current_date <= end_date:
-            date_str = current_date.strftime("%Y-%m-%d")
-            channel_dir = self.raw_dir / "telegram_messages" / date_str / channel
+        for offset in range((end_date.date() - start_day).days + 1):
+            date_str = (start_day + timedelta(days=offset)).isoformat()
+            channel_dir = self.messages_dir / date_str / channel
             
             if channel_dir.exists():
-                for file_path in channel_dir.glob("messages_*.json"):
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            file_messages = json.load(f)
-                            messages.extend(file_messages)
-                    except Exception as e:
-                        telegram_logger.log_scraping_error(
-                            channel, e, f"loading_messages_from_{file_path}"
-                        )
-            
-            current_date += timedelta(days=1)
+                paths.extend(channel_dir.glob(MESSAGE_FILE_GLOB))
+        
+        messages = []
+        for file_path, blob in self._read_files(paths):
+            try:
+                if isinstance(blob, Exception):
+                    raise blob
+                messages.extend(self._parse_messages(file_path, blob))
+            except Exception as e:
+                get_telegram_logger().log_scraping_error(
+                    channel, e, "loading_messages", str(file_path)
+                )
         
         return messages
     
@@ -163,26 +475,30 @@ class DataLakeManager:
         # Find the most recent message files
         message_files = []
         
-        for date_dir in sorted(self.raw_dir.glob("telegram_messages/*"), reverse=True):
+        for date_dir in sorted(self.messages_dir.glob("*"), reverse=True):
             channel_dir = date_dir / channel
             if channel_dir.exists():
-                for file_path in sorted(channel_dir.glob("messages_*.json"), reverse=True):
+                for file_path in sorted(channel_dir.glob(MESSAGE_FILE_GLOB), reverse=True):
                     message_files.append(file_path)
         
-        messages = []
-        for file_path in message_files[:limit]:
+        per_file_messages = []
+        for file_path, blob in self._read_files(message_files[:limit]):
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    file_messages = json.load(f)
-                    messages.extend(file_messages)
+                if isinstance(blob, Exception):
+                    raise blob
+                file_messages = self._parse_messages(file_path, blob)
+                for message in file_messages:
+                    message.setdefault('date', '')
+                file_messages.sort(key=MESSAGE_DATE_KEY, reverse=True)
+                per_file_messages.append(file_messages)
             except Exception as e:
-                telegram_logger.log_scraping_error(
-                    channel, e, f"loading_latest_messages_from_{file_path}"
+                get_telegram_logger().log_scraping_error(
+                    channel, e, "loading_latest_messages", str(file_path)
                 )
         
-        # Sort by message date and return the latest
-        messages.sort(key=lambda x: x.get('date', ''), reverse=True)
-        return messages[:limit]
+        # Each file is sorted newest-first, so a k-way merge yields the latest overall
+        merged = heapq.merge(*per_file_messages, key=MESSAGE_DATE_KEY, reverse=True)
+        return list(islice(merged, limit))
     
     def validate_data_integrity(self, channel: str) -> Dict[str, Any]:
         """Validate the integrity of stored data for a channel."""
@@ -198,64 +514,74 @@ class DataLakeManager:
             "errors": []
         }
         
-        message_hashes = set()
+        # Collect every target file up front so reads can be issued as one batch
+        paths, expected_messages = self._get_channel_files(channel)
         
-        for date_dir in self.raw_dir.glob("telegram_messages/*"):
-            channel_dir = date_dir / channel
-            if not channel_dir.exists():
-                continue
+        # Exact for typical channels; on long histories a Bloom filter sized from
+        # the manifest's message count keeps memory at ~4 bytes per hash, at the
+        # cost of a ~1e-6 chance of over-counting a duplicate
+        seen_hashes = _ScalableBloomFilter(initial_capacity=max(expected_messages, BLOOM_EXACT_LIMIT))
+        
+        for file_path, blob in self._read_files(paths):
+            validation_results["total_files"] += 1
             
-            for file_path in channel_dir.glob("messages_*.json"):
-                validation_results["total_files"] += 1
-                
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        messages = json.load(f)
-                    
-                    if not isinstance(messages, list):
-                        validation_results["errors"].append(f"Invalid format in {file_path}")
-                        validation_results["invalid_files"] += 1
-                        continue
-                    
-                    validation_results["valid_files"] += 1
-                    validation_results["total_messages"] += len(messages)
-                    
-                    # Check for duplicates and missing fields
-                    for message in messages:
-                        message_hash = message.get("_metadata", {}).get("message_hash")
-                        if message_hash:
-                            if message_hash in message_hashes:
-                                validation_results["duplicate_messages"] += 1
-                            else:
-                                message_hashes.add(message_hash)
-                        
-                        # Check for required fields
-                        required_fields = ["message_id", "channel_username", "date", "text"]
-                        for field in required_fields:
-                            if field not in message:
-                                validation_results["missing_fields"].append(field)
+            try:
+                if isinstance(blob, Exception):
+                    raise blob
+                messages = self._parse_messages(file_path, blob)
                 
-                except Exception as e:
-                    validation_results["errors"].append(f"Error reading {file_path}: {str(e)}")
+                if not isinstance(messages, list):
+                    validation_results["errors"].append(f"Invalid format in {file_path}")
                     validation_results["invalid_files"] += 1
+                    continue
+                
+                validation_results["valid_files"] += 1
+                validation_results["total_messages"] += len(messages)
+                
+                # Check for duplicates within the file and against earlier files
+                hashes = [
+                    message_hash
+                    for message in messages
+                    if (message_hash := message.get("_metadata", {}).get("message_hash"))
+                ]
+                file_hashes = set(hashes)
+                validation_results["duplicate_messages"] += len(hashes) - len(file_hashes)
+                for message_hash in file_hashes:
+                    if seen_hashes.add(message_hash):
+                        validation_results["duplicate_messages"] += 1
+                
+                # Check for required fields
+                for message in messages:
+                    missing = REQUIRED_MESSAGE_FIELDS - message.keys()
+                    if missing:
+                        validation_results["missing_fields"].extend(sorted(missing))
+            
+            except Exception as e:
+                validation_results["errors"].append(f"Error reading {file_path}: {str(e)}")
+                validation_results["invalid_files"] += 1
         
         return validation_results
     
     def cleanup_old_data(self, days_to_keep: int = 90):
         """Clean up old data files to save storage space."""
-        cutoff_date = datetime.now() - timedelta(days=days_to_keep)
+        # Partition names are ISO dates, so they order the same as strings
+        cutoff_str = (datetime.now() - timedelta(days=days_to_keep)).date().isoformat()
         
-        for date_dir in self.raw_dir.glob("telegram_messages/*"):
-            try:
-                date_str = date_dir.name
-                dir_date = datetime.strptime(date_str, "%Y-%m-%d")
-                
-                if dir_date < cutoff_date:
-                    shutil.rmtree(date_dir)
-                    print(f"🗑️  Removed old data directory: {date_dir}")
+        for date_dir in self.messages_dir.glob("*"):
+            date_str = date_dir.name
+            if len(date_str) != len(cutoff_str) or not date_str[:4].isdigit():
+                continue
             
-            except Exception as e:
-                print(f"⚠️  Error cleaning up {date_dir}: {str(e)}")
+            if date_str < cutoff_str:
+                try:
+                    shutil.rmtree(date_dir)
+                    with self._manifest_lock:
+                        manifest = self._get_manifest()
+                        with manifest:
+                            manifest.execute("DELETE FROM files WHERE date = ?", (date_str,))
+                    log_scraping_operation("data_lake", "cleanup", removed=str(date_dir))
+                except Exception as e:
+                    get_telegram_logger().log_scraping_error("data_lake", e, "cleanup", str(date_dir))
     
     def get_data_lake_stats(self) -> Dict[str, Any]:
         """Get statistics about the data lake."""
@@ -273,27 +599,72 @@ class DataLakeManager:
         all_dates = set()
         channels = set()
         
-        for date_dir in self.raw_dir.glob("telegram_messages/*"):
+        if self._partition_cache is None:
+            self._partition_cache = self._load_partition_cache()
+        
+        # Partitions whose directory mtime changed since the last scan
+        stale_partitions = {}
+        partition_cache = {}
+        paths = []
+        messages_size = 0
+        
+        for date_dir in self.messages_dir.glob("*"):
             all_dates.add(date_dir.name)
             
-            for channel_dir in date_dir.iterdir():
-                if channel_dir.is_dir():
-                    channels.add(channel_dir.name)
+            with os.scandir(date_dir) as entries:
+                for entry in entries:
+                    if not entry.is_dir():
+                        continue
+                    
+                    channels.add(entry.name)
                     
-                    if channel_dir.name not in stats["channel_stats"]:
-                        stats["channel_stats"][channel_dir.name] = {
+                    if entry.name not in stats["channel_stats"]:
+                        stats["channel_stats"][entry.name] = {
                             "total_messages": 0,
                             "date_range": {"earliest": None, "latest": None}
                         }
                     
-                    for file_path in channel_dir.glob("messages_*.json"):
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                messages = json.load(f)
-                                stats["channel_stats"][channel_dir.name]["total_messages"] += len(messages)
-                                stats["total_messages"] += len(messages)
-                        except:
-                            pass
+                    # A partition's mtime changes whenever a file is added or removed
+                    mtime_ns = entry.stat().st_mtime_ns
+                    cached = self._partition_cache.get(entry.path)
+                    
+                    if cached and cached[0] == mtime_ns:
+                        partition_cache[entry.path] = cached
+                        stats["channel_stats"][entry.name]["total_messages"] += cached[1]
+                        stats["total_messages"] += cached[1]
+                        messages_size += cached[2]
+                    else:
+                        channel_dir = Path(entry.path)
+                        stale_partitions[channel_dir] = mtime_ns
+                        paths.extend(channel_dir.glob(MESSAGE_FILE_GLOB))
+        
+        partition_counts = dict.fromkeys(stale_partitions, 0)
+        
+        for file_path, blob in self._read_files(paths):
+            try:
+                if isinstance(blob, Exception):
+                    raise blob
+                messages = self._parse_messages(file_path, blob)
+                partition_counts[file_path.parent] += len(messages)
+            except (OSError, ValueError, zlib.error) as e:
+                # An unreadable file counts as empty rather than failing the stats
+                get_telegram_logger().log_scraping_error(
+                    file_path.parent.name, e, "data_lake_stats", str(file_path)
+                )
+        
+        for channel_dir, mtime_ns in stale_partitions.items():
+            count = partition_counts[channel_dir]
+            size = self._get_directory_size(channel_dir)
+            partition_cache[str(channel_dir)] = (mtime_ns, count, size)
+            stats["channel_stats"][channel_dir.name]["total_messages"] += count
+            stats["total_messages"] += count
+            messages_size += size
+        
+        # Replacing the cache also drops partitions removed by cleanup_old_data;
+        # it is persisted here, whenever it changed, for later runs
+        if partition_cache != self._partition_cache:
+            self._partition_cache = partition_cache
+            self._save_partition_cache()
         
         stats["total_channels"] = len(channels)
         
@@ -305,31 +676,163 @@ class DataLakeManager:
         
         # Calculate storage size
         stats["storage_size"] = {
-            "raw_messages": self._get_directory_size(self.raw_dir / "telegram_messages"),
+            "raw_messages": messages_size,
             "raw_images": self._get_directory_size(self.raw_dir / "telegram_images"),
             "raw_documents": self._get_directory_size(self.raw_dir / "telegram_documents")
         }
         
         return stats
     
+    def _load_partition_cache(self) -> Dict[str, Tuple[int, int, int]]:
+        """Load the persisted partition stats cache, if any."""
+        try:
+            cache = orjson.loads(self.stats_cache_file.read_bytes())
+            return {key: tuple(entry) for key, entry in cache.items()}
+        except Exception:
+            return {}
+    
+    def _save_partition_cache(self):
+        """Persist the partition stats cache so later runs can skip unchanged partitions."""
+        if self._partition_cache is None or not self.data_dir.exists():
+            return
+        
+        try:
+            self.stats_cache_file.write_bytes(orjson.dumps(self._partition_cache))
+        except Exception as e:
+            get_telegram_logger().log_scraping_error("data_lake", e, "save_stats_cache")
+    
+    def _read_files(
+        self, 
+        paths: List[Path]
+    ) -> Iterator[Tuple[Path, Union[bytes, Exception]]]:
+        """
+        Read a batch of files, yielding each path with its raw bytes.
+        
+        Files are read and decompressed concurrently on a thread pool (both
+        release the GIL) and yielded in input order. Only READ_AHEAD_PER_WORKER
+        reads per worker are kept in flight, so decompressed bytes can't pile
+        up ahead of the caller's parsing. Read failures are yielded in place of
+        the bytes so callers can record them against the offending file without
+        aborting the whole batch.
+        """
+        if not paths:
+            return
+        
+        workers = min(READ_WORKERS, len(paths))
+        remaining = iter(paths)
+        pool = ThreadPoolExecutor(max_workers=workers)
+        try:
+            in_flight = deque(
+                pool.submit(self._read_one, file_path)
+                for file_path in islice(remaining, workers * READ_AHEAD_PER_WORKER)
+            )
+            while in_flight:
+                result = in_flight.popleft().result()
+                for file_path in islice(remaining, 1):
+                    in_flight.append(pool.submit(self._read_one, file_path))
+                yield result
+        finally:
+            # If the caller stops early, drop queued reads instead of waiting on them
+            pool.shutdown(cancel_futures=True)
+    
+    def _read_one(self, file_path: Path) -> Tuple[Path, Union[bytes, Exception]]:
+        """Read a single file for _read_files, capturing any error."""
+        try:
+            return file_path, self._read_message_file(file_path)
+        except Exception as e:
+            return file_path, e
+    
+    def _parse_messages(self, file_path: Path, blob: bytes) -> List[Dict[str, Any]]:
+        """Parse a message file's bytes as NDJSON or a legacy JSON array."""
+        if ".ndjson" in file_path.suffixes:
+            return [orjson.loads(line) for line in blob.splitlines() if line]
+        return orjson.loads(blob)
+    
+    def _read_message_file(self, file_path: Path) -> bytes:
+        """Read a message file, decompressing gzip partitions transparently."""
+        data = file_path.read_bytes()
+        if file_path.suffix == ".gz":
+            return self._decompress_members(file_path, data)
+        return data
+    
+    @staticmethod
+    def _decompress_members(file_path: Path, data: bytes) -> bytes:
+        """
+        Decompress a gzip file one member at a time, skipping torn members.
+        
+        Shards are appended to as one gzip member per batch, so a crash mid-write
+        leaves a truncated member behind. Rather than failing the whole file, a
+        member that doesn't decompress cleanly (the CRC check catches garbage) is
+        dropped and reading resumes at the next member header.
+        """
+        view = memoryview(data)
+        chunks = []
+        skipped = 0
+        pos = 0
+        
+        while pos < len(data):
+            decompressor = zlib.decompressobj(wbits=31)
+            try:
+                chunk = decompressor.decompress(view[pos:])
+                if not decompressor.eof:
+                    raise zlib.error("truncated gzip member")
+            except zlib.error:
+                skipped += 1
+                pos = data.find(GZIP_MEMBER_HEADER, pos + 1)
+                if pos == -1:
+                    break
+                continue
+            
+            chunks.append(chunk)
+            pos = len(data) - len(decompressor.unused_data)
+        
+        if skipped:
+            get_telegram_logger().log_scraping_error(
+                "data_lake", 
+                zlib.error(f"skipped {skipped} unreadable gzip member(s)"), 
+                "read_message_file", 
+                str(file_path)
+            )
+        
+        return b"".join(chunks)
+    
     def _get_directory_size(self, directory: Path) -> int:
         """Calculate the size of a directory in bytes."""
+        if not directory.exists():
+            return 0
+        return self._scan_directory_size(str(directory))
+    
+    def _scan_directory_size(self, path: str) -> int:
+        """Recursively sum file sizes using scandir's cached directory entries."""
         total_size = 0
-        if directory.exists():
-            for file_path in directory.rglob("*"):
-                if file_path.is_file():
-                    total_size += file_path.stat().st_size
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    total_size += entry.stat(follow_symlinks=False).st_size
+                elif entry.is_dir(follow_symlinks=False):
+                    total_size += self._scan_directory_size(entry.path)
         return total_size
     
     def _generate_message_hash(self, message: Dict[str, Any]) -> str:
         """Generate a hash for a message to detect duplicates."""
-        # Create a string representation of the message content
-        content = f"{message.get('message_id', '')}{message.get('date', '')}{message.get('text', '')}"
-        return hashlib.md5(content.encode('utf-8')).hexdigest()
+        # Dedup only, so a fast non-cryptographic-strength digest is enough;
+        # feed the fields incrementally instead of building a joined string
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(str(message.get('message_id', '')).encode('utf-8'))
+        hasher.update(str(message.get('date', '')).encode('utf-8'))
+        hasher.update(str(message.get('text', '')).encode('utf-8'))
+        return hasher.hexdigest()
+
+
+@cache
+def get_data_lake_manager() -> DataLakeManager:
+    """Get the shared data lake manager, creating it on first use."""
+    return DataLakeManager()
 
 
-# Global data lake manager instance
-data_lake_manager = DataLakeManager()
+def _validate_channel(channel: str) -> Dict[str, Any]:
+    """Validate one channel in a worker process using that process's manager."""
+    return get_data_lake_manager().validate_data_integrity(channel)
 
 
 if __name__ == "__main__":
@@ -337,10 +840,12 @@ if __name__ == "__main__":
     print("Testing Data Lake Manager...")
     
     # Get stats
+    data_lake_manager = get_data_lake_manager()
     stats = data_lake_manager.get_data_lake_stats()
     print(f"Data Lake Stats: {json.dumps(stats, indent=2)}")
     
-    # Test validation
-    for channel in ["chemed", "lobelia4cosmetics", "tikvahpharma"]:
-        validation = data_lake_manager.validate_data_integrity(channel)
-        print(f"Validation for {channel}: {validation}") 
\ No newline at end of file
+    # Test validation, one process per channel
+    channels = ["chemed", "lobelia4cosmetics", "tikvahpharma"]
+    with ProcessPoolExecutor(max_workers=len(channels)) as executor:
+        for channel, validation in zip(channels, executor.map(_validate_channel, channels)):
+            print(f"Validation for {channel}: {validation}") 
\ No newline at end of file
@@ -4,21 +4,62 @@ Orchestrates scraping of medical business channels and saves data to the data la
 """
 
 import asyncio
-import json
+import contextlib
+import gzip
+import random
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-import time
+from typing import List, Dict, Any, Optional, BinaryIO
 
-from app.services.telegram.client import TelegramClientService
-from app.utils.logging.logger import telegram_logger, scraping_metrics
+import orjson
+
+from app.services.telegram.client import TelegramClientService, get_shared_client, close_shared_client
+from app.services.scrapers.data_lake_manager import get_data_lake_manager
+from app.utils.logging.logger import get_telegram_logger, get_scraping_metrics
 from config import settings
 
 
+# Upper bound on channels scraped at once over the shared Telegram connection
+MAX_CONCURRENT_CHANNELS = 3
+
+# Maximum random delay (seconds) before each channel starts scraping
+CHANNEL_START_JITTER_SECONDS = 2.0
+
+# Serialized messages are flushed to the partition file every this many rows
+MESSAGE_FLUSH_EVERY = 500
+
+# gzip level for partition files; each flush is appended as its own gzip member
+MESSAGE_COMPRESS_LEVEL = 6
+
+# Options for one NDJSON message line
+MESSAGE_LINE_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+
+
+def _serialize_telethon_value(obj: Any) -> Any:
+    """orjson fallback for raw Telethon values (bytes, TL objects) on message rows."""
+    if isinstance(obj, bytes):
+        return obj.hex()
+    to_dict = getattr(obj, 'to_dict', None)
+    if to_dict is not None:
+        return to_dict()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
 class TelegramScraper:
     """Main scraper for Telegram medical business channels."""
     
-    def __init__(self):
+    def __init__(
+        self, 
+        client: Optional[TelegramClientService] = None, 
+        channel_info_cache: Optional[Dict[str, Dict[str, Any]]] = None
+    ):
+        # Connected client to scrape with; the shared client is used when not given
+        self._client = client
+        
+        # Channel info by username, possibly already fetched by the caller; channels
+        # found here skip the info lookup, and new lookups are added to it
+        self.channel_info_cache = channel_info_cache if channel_info_cache is not None else {}
+        
         self.channels = [
             "chemed",  # Chemed Telegram Channel
             "lobelia4cosmetics",  # Lobelia4cosmetics
@@ -30,42 +71,63 @@ class TelegramScraper:
         self.raw_messages_dir = self.data_dir / "raw" / "telegram_messages"
         self.raw_images_dir = self.data_dir / "raw" / "telegram_images"
         
+        # Newest scraped message id per channel, used to resume incremental scrapes
+        self.scrape_state_file = self.data_dir / "raw" / "scrape_state.json"
+        
         # Create directories
         self.raw_messages_dir.mkdir(parents=True, exist_ok=True)
         self.raw_images_dir.mkdir(parents=True, exist_ok=True)
     
-    async def scrape_all_channels(self, limit_per_channel: int = 1000, days_back: int = 30):
+    async def scrape_all_channels(
+        self, 
+        limit_per_channel: int = 1000, 
+        days_back: int = 30, 
+        offset_date: Optional[datetime] = None, 
+        resume: bool = False
+    ):
         """
         Scrape all configured channels.
         
         Args:
             limit_per_channel: Maximum messages to scrape per channel
-            days_back: Number of days back to scrape (for incremental scraping)
+            days_back: Number of days back to scrape (ignored if offset_date is given)
+            offset_date: Only scrape messages newer than this date
+            resume: Skip messages at or below each channel's last scraped id
         """
-        telegram_logger.log_scraping_start("all_channels", "batch_scraping")
+        get_telegram_logger().log_scraping_start("all_channels", "batch_scraping")
         
         results = {}
-        offset_date = datetime.now() - timedelta(days=days_back) if days_back > 0 else None
+        if offset_date is None and days_back > 0:
+            offset_date = datetime.now() - timedelta(days=days_back)
+        scrape_state = self._load_scrape_state() if resume else {}
         
-        async with TelegramClientService() as client:
-            for channel in self.channels:
-                try:
-                    print(f"🔄 Scraping channel: {channel}")
-                    channel_results = await self._scrape_channel(
-                        client, 
-                        channel, 
-                        limit_per_channel, 
-                        offset_date
-                    )
-                    results[channel] = channel_results
-                    
-                    # Small delay between channels to be respectful
-                    await asyncio.sleep(2)
-                    
-                except Exception as e:
-                    telegram_logger.log_scraping_error(channel, e, "channel_scraping")
-                    results[channel] = {"error": str(e)}
-                    continue
+        client = self._client or await get_shared_client()
+        await client.warm_entity_cache(self.channels)
+        
+        # Channels are network-bound, so scrape them concurrently (bounded)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CHANNELS)
+        tasks = [
+            asyncio.create_task(
+                self._scrape_channel_bounded(
+                    semaphore, 
+                    client, 
+                    channel, 
+                    limit_per_channel, 
+                    offset_date, 
+                    scrape_state.get(channel, 0)
+                )
+            )
+            for channel in self.channels
+        ]
+        channel_results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        for channel, channel_result in zip(self.channels, channel_results):
+            if isinstance(channel_result, BaseException):
+                get_telegram_logger().log_scraping_error(channel, channel_result, "channel_scraping")
+                channel_result = {"error": str(channel_result)}
+            results[channel] = channel_result
+        
+        self._save_scrape_state(results)
         
         # Generate summary report
         await self._generate_scraping_report(results)
@@ -76,7 +138,9 @@ class TelegramScraper:
         self, 
         channel_username: str, 
         limit: int = 1000, 
-        days_back: int = 30
+        days_back: int = 30, 
+        offset_date: Optional[datetime] = None, 
+        resume: bool = False
     ) -> Dict[str, Any]:
         """
         Scrape a single channel.
@@ -84,52 +148,101 @@ class TelegramScraper:
         Args:
             channel_username: Username of the channel to scrape
             limit: Maximum messages to scrape
-            days_back: Number of days back to scrape
+            days_back: Number of days back to scrape (ignored if offset_date is given)
+            offset_date: Only scrape messages newer than this date
+            resume: Skip messages at or below the channel's last scraped id
         """
-        offset_date = datetime.now() - timedelta(days=days_back) if days_back > 0 else None
+        if offset_date is None and days_back > 0:
+            offset_date = datetime.now() - timedelta(days=days_back)
+        min_id = self._load_scrape_state().get(channel_username, 0) if resume else 0
+        
+        client = self._client or await get_shared_client()
+        result = await self._scrape_channel(client, channel_username, limit, offset_date, min_id)
+        
+        self._save_scrape_state({channel_username: result})
+        return result
+    
+    async def _scrape_channel_bounded(
+        self, 
+        semaphore: asyncio.Semaphore, 
+        client: TelegramClientService, 
+        channel_username: str, 
+        limit: int, 
+        offset_date: Optional[datetime], 
+        min_id: int = 0
+    ) -> Dict[str, Any]:
+        """Scrape a channel once a concurrency slot is free, after a jittered start."""
+        # Small random delay so channels don't all hit the API at the same instant
+        await asyncio.sleep(random.uniform(0, CHANNEL_START_JITTER_SECONDS))
         
-        async with TelegramClientService() as client:
-            return await self._scrape_channel(client, channel_username, limit, offset_date)
+        async with semaphore:
+            print(f"🔄 Scraping channel: {channel_username}")
+            return await self._scrape_channel(client, channel_username, limit, offset_date, min_id)
     
     async def _scrape_channel(
         self, 
         client: TelegramClientService, 
         channel_username: str, 
         limit: int, 
-        offset_date: Optional[datetime]
+        offset_date: Optional[datetime], 
+        min_id: int = 0
     ) -> Dict[str, Any]:
         """Scrape a single channel and save data."""
         try:
             # Get channel info
-            channel_info = await client.get_channel_info(channel_username)
-            if not channel_info:
-                return {"error": "Could not get channel info"}
+            channel_info = self.channel_info_cache.get(channel_username)
+            if channel_info is None:
+                channel_info = await client.get_channel_info(channel_username)
+                if not channel_info:
+                    return {"error": "Could not get channel info"}
+                self.channel_info_cache[channel_username] = channel_info
             
-            # Create date-based directory structure
+            # Date-based directory structure, created along with the file below
             date_str = datetime.now().strftime("%Y-%m-%d")
             channel_dir = self.raw_messages_dir / date_str / channel_username
-            channel_dir.mkdir(parents=True, exist_ok=True)
             
-            # Scrape messages
-            messages = []
+            # Scrape messages, streaming each row into one NDJSON file per partition.
+            # Rows are serialized as they arrive, so only their bytes are held until a flush.
+            pending = bytearray()
+            pending_count = 0
             message_count = 0
             image_count = 0
+            last_message_id = min_id
+            messages_file = channel_dir / f"messages_{date_str}.ndjson.gz"
             
-            async for message_data in client.scrape_messages(channel_username, limit, offset_date):
-                messages.append(message_data)
-                message_count += 1
-                
-                if message_data.get("has_image"):
-                    image_count += 1
-                
-                # Save in batches to avoid memory issues
-                if len(messages) >= 100:
-                    await self._save_messages_batch(channel_username, messages, channel_dir)
-                    messages = []
+            # Rows already name their media paths, so downloads that fail are recorded in the metadata
+            failed_media: List[str] = []
             
-            # Save remaining messages
-            if messages:
-                await self._save_messages_batch(channel_username, messages, channel_dir)
+            # aclosing: a failed flush stops the scrape and its media workers right away
+            scraped = client.scrape_messages(
+                channel_username, limit, offset_date, min_id=min_id, failed_media=failed_media
+            )
+            async with contextlib.aclosing(scraped):
+                # Opened off the event loop, like every write to it; by the time it
+                # is closed each batch has already been flushed
+                out = await asyncio.to_thread(self._open_partition_file, messages_file)
+                with out:
+                    async for message_data in scraped:
+                        pending += orjson.dumps(
+                            message_data, 
+                            default=_serialize_telethon_value, 
+                            option=MESSAGE_LINE_OPTIONS
+                        )
+                        pending_count += 1
+                        message_count += 1
+                        last_message_id = max(last_message_id, message_data["message_id"])
+                        
+                        if message_data.get("has_image"):
+                            image_count += 1
+                        
+                        if pending_count >= MESSAGE_FLUSH_EVERY:
+                            await self._flush_messages(channel_username, out, messages_file, pending, pending_count)
+                            pending.clear()
+                            pending_count = 0
+                    
+                    # Flush remaining messages
+                    if pending_count:
+                        await self._flush_messages(channel_username, out, messages_file, pending, pending_count)
             
             # Save channel metadata
             metadata = {
@@ -138,16 +251,16 @@ class TelegramScraper:
                     "scraped_at": datetime.now().isoformat(),
                     "messages_scraped": message_count,
                     "images_scraped": image_count,
+                    "failed_media": [int(message_id) for message_id in failed_media],
                     "limit": limit,
                     "offset_date": offset_date.isoformat() if offset_date else None
                 }
             }
             
             metadata_file = channel_dir / "metadata.json"
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2, ensure_ascii=False)
+            await asyncio.to_thread(self._write_json, metadata_file, metadata)
             
-            telegram_logger.log_data_saved(
+            get_telegram_logger().log_data_saved(
                 channel_username, 
                 str(channel_dir), 
                 message_count
@@ -158,69 +271,121 @@ class TelegramScraper:
                 "channel_info": channel_info,
                 "messages_scraped": message_count,
                 "images_scraped": image_count,
+                "last_message_id": last_message_id,
                 "data_path": str(channel_dir)
             }
             
         except Exception as e:
-            telegram_logger.log_scraping_error(channel_username, e, "channel_scraping")
+            get_telegram_logger().log_scraping_error(channel_username, e, "channel_scraping")
             return {"error": str(e)}
     
-    async def _save_messages_batch(
+    async def _flush_messages(
         self, 
         channel_username: str, 
-        messages: List[Dict[str, Any]], 
-        channel_dir: Path
+        out: BinaryIO, 
+        file_path: Path, 
+        data: bytearray, 
+        message_count: int
     ):
-        """Save a batch of messages to JSON files."""
+        """
+        Append serialized NDJSON lines to the channel's file and register them.
+        
+        Failures are logged and re-raised, so the channel is reported as failed
+        and its resume state is not advanced past rows that never reached disk.
+        """
         try:
-            # Create timestamped filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"messages_{timestamp}_{len(messages)}.json"
-            file_path = channel_dir / filename
-            
-            # Save messages with proper encoding
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(messages, f, indent=2, ensure_ascii=False)
+            # Written and registered in one hop off the event loop, so the manifest
+            # upsert doesn't stall the other channels being scraped
+            await asyncio.to_thread(
+                self._write_and_register, channel_username, out, file_path, data, message_count
+            )
             
-            telegram_logger.log_data_saved(
+            get_telegram_logger().log_data_saved(
                 channel_username, 
                 str(file_path), 
-                len(messages)
+                message_count
             )
             
         except Exception as e:
-            telegram_logger.log_scraping_error(channel_username, e, "batch_save")
+            get_telegram_logger().log_scraping_error(channel_username, e, "batch_save")
+            raise
+    
+    @staticmethod
+    def _open_partition_file(file_path: Path) -> BinaryIO:
+        """Create a partition's directory and open its message file for appending; run via asyncio.to_thread."""
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        return open(file_path, 'ab')
+    
+    @staticmethod
+    def _write_and_register(
+        channel_username: str, 
+        out: BinaryIO, 
+        file_path: Path, 
+        data: bytes, 
+        message_count: int
+    ):
+        """
+        Append a chunk as one gzip member, flush it and record it in the manifest.
+        
+        Flushing first means each batch is on disk once registered. Runs via
+        asyncio.to_thread.
+        """
+        out.write(gzip.compress(data, compresslevel=MESSAGE_COMPRESS_LEVEL))
+        out.flush()
+        
+        get_data_lake_manager().register_file(
+            channel_username, 
+            file_path.parent.parent.name, 
+            file_path, 
+            message_count
+        )
+    
+    @staticmethod
+    def _write_json(file_path: Path, data: Dict[str, Any]):
+        """Serialize and write an indented JSON file; run via asyncio.to_thread."""
+        file_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    
+    def _load_scrape_state(self) -> Dict[str, int]:
+        """Load the newest scraped message id per channel."""
+        try:
+            return orjson.loads(self.scrape_state_file.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return {}
+    
+    def _save_scrape_state(self, results: Dict[str, Any]):
+        """Record the newest scraped message id for each successful channel."""
+        state = self._load_scrape_state()
+        for channel, result in results.items():
+            last_message_id = result.get("last_message_id")
+            if last_message_id:
+                state[channel] = max(last_message_id, state.get(channel, 0))
+        
+        try:
+            self.scrape_state_file.write_bytes(orjson.dumps(state))
+        except OSError as e:
+            get_telegram_logger().log_scraping_error("all_channels", e, "save_scrape_state")
     
     async def _generate_scraping_report(self, results: Dict[str, Any]):
         """Generate a summary report of the scraping operation."""
-        report = {
-            "scraping_report": {
-                "generated_at": datetime.now().isoformat(),
-                "total_channels": len(self.channels),
-                "successful_channels": 0,
-                "failed_channels": 0,
-                "total_messages": 0,
-                "total_images": 0,
-                "channel_results": results
-            }
+        successes = [result for result in results.values() if result.get("success")]
+        summary = {
+            "generated_at": datetime.now().isoformat(),
+            "total_channels": len(self.channels),
+            "successful_channels": len(successes),
+            "failed_channels": len(results) - len(successes),
+            "total_messages": sum(result.get("messages_scraped", 0) for result in successes),
+            "total_images": sum(result.get("images_scraped", 0) for result in successes),
+            "channel_results": results
         }
-        
-        for channel, result in results.items():
-            if result.get("success"):
-                report["scraping_report"]["successful_channels"] += 1
-                report["scraping_report"]["total_messages"] += result.get("messages_scraped", 0)
-                report["scraping_report"]["total_images"] += result.get("images_scraped", 0)
-            else:
-                report["scraping_report"]["failed_channels"] += 1
+        report = {"scraping_report": summary}
         
         # Save report
         report_file = self.data_dir / "raw" / f"scraping_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        await asyncio.to_thread(self._write_json, report_file, report)
         
-        print(f"📊 Scraping Report: {report['scraping_report']['successful_channels']}/{report['scraping_report']['total_channels']} channels successful")
-        print(f"📝 Total messages: {report['scraping_report']['total_messages']}")
-        print(f"🖼️  Total images: {report['scraping_report']['total_images']}")
+        print(f"📊 Scraping Report: {summary['successful_channels']}/{summary['total_channels']} channels successful")
+        print(f"📝 Total messages: {summary['total_messages']}")
+        print(f"🖼️  Total images: {summary['total_images']}")
     
     def get_scraping_status(self) -> Dict[str, Any]:
         """Get the current status of scraping operations."""
@@ -230,7 +395,7 @@ class TelegramScraper:
         }
         
         for channel in self.channels:
-            summary = scraping_metrics.get_channel_summary(channel)
+            summary = get_scraping_metrics().get_channel_summary(channel)
             status["channel_summaries"][channel] = summary
         
         return status
@@ -243,20 +408,30 @@ class TelegramScraper:
             hours_back: Number of hours back to scrape
         """
         print(f"🔄 Starting incremental scrape for last {hours_back} hours")
-        return await self.scrape_all_channels(limit_per_channel=500, days_back=hours_back/24)
+        return await self.scrape_all_channels(
+            limit_per_channel=500, 
+            offset_date=datetime.now() - timedelta(hours=hours_back), 
+            resume=True
+        )
 
 
 # Convenience functions
 async def scrape_ethiopian_medical_channels(limit_per_channel: int = 1000):
     """Convenience function to scrape all Ethiopian medical channels."""
     scraper = TelegramScraper()
-    return await scraper.scrape_all_channels(limit_per_channel)
+    try:
+        return await scraper.scrape_all_channels(limit_per_channel)
+    finally:
+        await close_shared_client()
 
 
 async def incremental_scrape_recent(hours_back: int = 24):
     """Convenience function for incremental scraping."""
     scraper = TelegramScraper()
-    return await scraper.incremental_scrape(hours_back)
+    try:
+        return await scraper.incremental_scrape(hours_back)
+    finally:
+        await close_shared_client()
 
 
 if __name__ == "__main__":
@@ -264,10 +439,13 @@ if __name__ == "__main__":
     async def test_scraper():
         scraper = TelegramScraper()
         
-        # Test single channel scraping (small limit for testing)
-        print("Testing single channel scraping...")
-        result = await scraper.scrape_single_channel("telegram", limit=5)
-        print(f"Result: {result}")
+        try:
+            # Test single channel scraping (small limit for testing)
+            print("Testing single channel scraping...")
+            result = await scraper.scrape_single_channel("telegram", limit=5)
+            print(f"Result: {result}")
+        finally:
+            await close_shared_client()
         
         # Test status
         status = scraper.get_scraping_status()
@@ -4,20 +4,62 @@ Handles authentication and provides methods for scraping channels and downloadin
 """
 
 import asyncio
+import contextlib
 import os
+import random
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any, Optional, AsyncGenerator
+from typing import List, Dict, Any, Optional, AsyncGenerator, Sequence, Set, Tuple
 import json
 import time
 
+import orjson
 from telethon import TelegramClient, events
-from telethon.tl.types import Message, MessageMediaPhoto, MessageMediaDocument
-from telethon.errors import FloodWaitError, ChannelPrivateError, ChatAdminRequiredError
+from telethon.tl.types import Message, MessageMediaPhoto, MessageMediaDocument, InputPeerChannel
+from telethon.errors import FloodWaitError, ChannelInvalidError, ChannelPrivateError, ChatAdminRequiredError
 from telethon.sessions import StringSession
+from telethon.utils import get_extension, get_input_peer
 
 from config import settings
-from app.utils.logging.logger import telegram_logger, scraping_metrics
+from app.utils.logging.logger import get_telegram_logger, get_scraping_metrics
+
+
+# Media download workers spawned per scrape_messages call
+MEDIA_DOWNLOAD_WORKERS = 8
+
+# Cap on concurrent media downloads across all channels sharing this client
+MAX_CONCURRENT_DOWNLOADS = 8
+
+# Media up to this size is downloaded into memory and written off the event loop
+IN_MEMORY_DOWNLOAD_LIMIT = 20 * 1024 * 1024
+
+# Cap on channels iterating history at once over this client
+MAX_CONCURRENT_HISTORY_REQUESTS = 3
+
+# FloodWaitErrors tolerated per channel before giving up on it
+MAX_FLOOD_WAIT_RETRIES = 5
+
+# Maximum random delay (seconds) added to each flood wait, so waiting channels
+# don't all resume at the same instant and trip it again
+FLOOD_WAIT_JITTER_SECONDS = 2.0
+
+# scraped_at is stamped once per this many messages (one iter_messages page)
+SCRAPED_AT_REFRESH_EVERY = 100
+
+# Larger documents are fetched as this many byte ranges in parallel
+PARALLEL_DOWNLOAD_PARTS = 4
+
+# Bytes per GetFile request; range offsets are aligned to this
+DOWNLOAD_REQUEST_SIZE = 512 * 1024
+
+# Downloadable media classes -> (media type, flag key, paths key) on the message row
+_MEDIA_HANDLERS = {
+    MessageMediaPhoto: ("image", "has_image", "image_paths"),
+    MessageMediaDocument: ("document", "has_document", "document_paths"),
+}
+
+# Sentinel for optional TL attributes, so presence and value cost one lookup
+_MISSING = object()
 
 
 class TelegramClientService:
@@ -30,6 +72,25 @@ class TelegramClientService:
         self.client = None
         self.session_file = Path(settings.storage.data_dir) / "telegram_session.txt"
         self.session_file.parent.mkdir(parents=True, exist_ok=True)
+        self._download_semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+        
+        # Media directories already created, keyed by (media type, date, channel)
+        self.raw_dir = os.path.join(settings.storage.data_dir, "raw")
+        self._media_dirs: Dict[Tuple[str, str, str], str] = {}
+        self._connect_lock = asyncio.Lock()
+        self._history_semaphore = asyncio.Semaphore(MAX_CONCURRENT_HISTORY_REQUESTS)
+        
+        # Monotonic time until which Telegram asked this client to back off
+        self._flood_wait_until = 0.0
+        
+        # Resolved entities, so each username costs one ResolveUsername per process;
+        # channel input peers are also persisted so restarts can skip it entirely.
+        # Access hashes are only valid for the account that resolved them, so the
+        # persisted peers are keyed by account id and loaded once connected.
+        self.entities_file = Path(settings.storage.data_dir) / "telegram_entities.json"
+        self._entity_cache: Dict[str, Any] = {}
+        self._account_id: Optional[str] = None
+        self._input_peer_cache: Dict[str, InputPeerChannel] = {}
     
     async def __aenter__(self):
         """Async context manager entry."""
@@ -57,210 +118,490 @@ class TelegramClientService:
             
             await self.client.start(bot_token=self.bot_token)
             
-            # Save session for future use
-            session_string = self.client.session.save()
-            with open(self.session_file, 'w') as f:
-                f.write(session_string)
+            # Save session for future use (only rewritten when it actually changed),
+            # overlapping the file write with the get_me round trip
+            new_session_string = self.client.session.save()
+            async with asyncio.TaskGroup() as tg:
+                me_task = tg.create_task(self.client.get_me())
+                if new_session_string != session_string:
+                    tg.create_task(asyncio.to_thread(self.session_file.write_text, new_session_string))
             
-            telegram_logger.log_scraping_start("telegram_client", "connection")
-            print(f"✅ Connected to Telegram API as {await self.client.get_me()}")
+            me = me_task.result()
+            self._account_id = str(me.id)
+            self._input_peer_cache = self._load_input_peers()
+            
+            get_telegram_logger().log_scraping_start("telegram_client", "connection")
+            print(f"✅ Connected to Telegram API as {me}")
             
         except Exception as e:
-            telegram_logger.log_scraping_error("telegram_client", e, "connection")
+            get_telegram_logger().log_scraping_error("telegram_client", e, "connection")
             raise
     
+    async def ensure_connected(self):
+        """Connect on first use; later calls reuse the open connection."""
+        async with self._connect_lock:
+            if self.client is None or not self.client.is_connected():
+                await self.connect()
+    
     async def disconnect(self):
         """Disconnect from Telegram API."""
         if self.client:
             await self.client.disconnect()
-            telegram_logger.log_scraping_start("telegram_client", "disconnection")
+            self.client = None
+            get_telegram_logger().log_scraping_start("telegram_client", "disconnection")
     
-    async def get_channel_info(self, channel_username: str) -> Optional[Dict[str, Any]]:
-        """Get information about a Telegram channel."""
+    def _load_persisted_peers(self) -> Dict[str, Dict[str, List[int]]]:
+        """Read the persisted [channel id, access hash] pairs by account id, then username."""
         try:
-            entity = await self.client.get_entity(channel_username)
+            accounts = orjson.loads(self.entities_file.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return {}
+        if not isinstance(accounts, dict):
+            return {}
+        # Files from before peers were keyed by account map usernames straight to pairs
+        return {account: peers for account, peers in accounts.items() if isinstance(peers, dict)}
+    
+    def _load_input_peers(self) -> Dict[str, InputPeerChannel]:
+        """Load the logged-in account's persisted channel input peers by username."""
+        try:
+            peers = self._load_persisted_peers().get(self._account_id, {})
             return {
-                "id": entity.id,
-                "title": getattr(entity, 'title', None),
-                "username": getattr(entity, 'username', None),
-                "participants_count": getattr(entity, 'participants_count', None),
-                "description": getattr(entity, 'about', None),
-                "created_at": getattr(entity, 'date', None),
-                "verified": getattr(entity, 'verified', False),
-                "scam": getattr(entity, 'scam', False),
-                "fake": getattr(entity, 'fake', False)
+                username: InputPeerChannel(channel_id, access_hash)
+                for username, (channel_id, access_hash) in peers.items()
             }
-        except Exception as e:
-            telegram_logger.log_scraping_error(channel_username, e, "get_channel_info")
-            return None
+        except Exception:
+            return {}
+    
+    def _save_input_peers(self):
+        """Persist the account's channel input peers so later runs skip username resolution."""
+        if self._account_id is None:
+            return
+        
+        accounts = self._load_persisted_peers()
+        accounts[self._account_id] = {
+            username: [peer.channel_id, peer.access_hash]
+            for username, peer in self._input_peer_cache.items()
+        }
+        try:
+            self.entities_file.write_bytes(orjson.dumps(accounts))
+        except OSError as e:
+            get_telegram_logger().log_scraping_error("telegram_client", e, "save_entities")
+    
+    def _forget_input_peer(self, channel_username: str) -> bool:
+        """Drop a channel's cached input peer, returning whether there was one."""
+        if self._input_peer_cache.pop(channel_username, None) is None:
+            return False
+        self._entity_cache.pop(channel_username, None)
+        self._save_input_peers()
+        return True
+    
+    async def _get_entity(self, channel_username: str) -> Any:
+        """Resolve a channel's full entity, once per username."""
+        entity = self._entity_cache.get(channel_username)
+        if entity is None:
+            entity = await self.client.get_entity(channel_username)
+            self._entity_cache[channel_username] = entity
+            
+            input_peer = get_input_peer(entity)
+            if isinstance(input_peer, InputPeerChannel):
+                self._input_peer_cache[channel_username] = input_peer
+                self._save_input_peers()
+        return entity
+    
+    async def _get_input_entity(self, channel_username: str) -> Any:
+        """Get an input peer for API calls, avoiding a resolve when one is cached."""
+        input_peer = self._input_peer_cache.get(channel_username)
+        if input_peer is not None:
+            return input_peer
+        return await self._get_entity(channel_username)
+    
+    async def warm_entity_cache(self, channel_usernames: Sequence[str]):
+        """Resolve several channels concurrently so later calls hit the cache."""
+        # Failures are left for the per-channel calls to report
+        await asyncio.gather(
+            *(
+                self._get_entity(username)
+                for username in channel_usernames
+                if username not in self._entity_cache
+            ),
+            return_exceptions=True
+        )
+    
+    async def get_channel_info(self, channel_username: str) -> Optional[Dict[str, Any]]:
+        """Get information about a Telegram channel, waiting out any flood waits on the resolve."""
+        flood_retries = 0
+        while True:
+            try:
+                await self._wait_out_flood()
+                entity = await self._get_entity(channel_username)
+                break
+            except FloodWaitError as e:
+                flood_retries += 1
+                if flood_retries > MAX_FLOOD_WAIT_RETRIES:
+                    get_telegram_logger().log_scraping_error(channel_username, e, "rate_limit")
+                    return None
+                self._record_flood_wait(channel_username, e)
+            except Exception as e:
+                get_telegram_logger().log_scraping_error(channel_username, e, "get_channel_info")
+                return None
+        
+        return {
+            "id": entity.id,
+            "title": getattr(entity, 'title', None),
+            "username": getattr(entity, 'username', None),
+            "participants_count": getattr(entity, 'participants_count', None),
+            "description": getattr(entity, 'about', None),
+            "created_at": getattr(entity, 'date', None),
+            "verified": getattr(entity, 'verified', False),
+            "scam": getattr(entity, 'scam', False),
+            "fake": getattr(entity, 'fake', False)
+        }
     
     async def scrape_messages(
         self, 
         channel_username: str, 
         limit: int = 1000,
-        offset_date: Optional[datetime] = None
+        offset_date: Optional[datetime] = None,
+        min_id: int = 0,
+        failed_media: Optional[List[str]] = None
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Scrape messages from a Telegram channel.
         
+        Media paths are set on each row when it is yielded, before its download
+        has run; downloads that then fail are reported through failed_media.
+        
         Args:
             channel_username: Username of the channel (without @)
             limit: Maximum number of messages to scrape
             offset_date: Start scraping from this date (for incremental scraping)
+            min_id: Only scrape messages with an id above this (already scraped tail)
+            failed_media: Filled with the ids of messages whose media failed to download
         """
+        get_telegram_logger().log_scraping_start(channel_username, "message_scraping")
+        
+        message_count = 0
+        image_count = 0
+        fetched_count = 0
+        last_message_id = min_id
+        
+        # Media downloads run on background workers so they overlap with iteration
+        media_queue: asyncio.Queue = asyncio.Queue()
+        downloaded: List[str] = []
+        failed: List[str] = failed_media if failed_media is not None else []
+        media_workers = [
+            asyncio.create_task(self._media_worker(media_queue, downloaded, failed))
+            for _ in range(MEDIA_DOWNLOAD_WORKERS)
+        ]
+        
         try:
-            telegram_logger.log_scraping_start(channel_username, "message_scraping")
-            
-            entity = await self.client.get_entity(channel_username)
-            message_count = 0
-            image_count = 0
-            
-            async for message in self.client.iter_messages(
-                entity,
-                limit=limit,
-                offset_date=offset_date,
-                reverse=True  # Get oldest messages first
-            ):
-                if message is None:
-                    continue
-                
-                message_data = await self._process_message(message, channel_username)
-                if message_data:
-                    message_count += 1
-                    if message_data.get("has_image"):
-                        image_count += 1
+            # Throttling is reactive: only a FloodWaitError makes us wait. The wait is
+            # shared by every channel on this client so they don't each trip it again,
+            # and retries resume after the last message seen.
+            flood_retries = 0
+            while True:
+                try:
+                    await self._wait_out_flood()
+                    entity = await self._get_input_entity(channel_username)
                     
-                    yield message_data
-                
-                # Rate limiting - small delay between messages
-                await asyncio.sleep(0.1)
-            
-            telegram_logger.log_scraping_success(channel_username, message_count, image_count)
-            scraping_metrics.update_channel_metrics(channel_username, message_count, image_count)
+                    async with self._history_semaphore:
+                        async for message in self.client.iter_messages(
+                            entity,
+                            limit=limit - fetched_count if limit is not None else None,
+                            offset_date=offset_date,
+                            min_id=last_message_id,
+                            reverse=True  # Get oldest messages first
+                        ):
+                            if message is None:
+                                continue
+                            
+                            # Refresh the shared timestamp at the start of every page
+                            if fetched_count % SCRAPED_AT_REFRESH_EVERY == 0:
+                                scraped_at = datetime.now().isoformat()
+                            
+                            fetched_count += 1
+                            last_message_id = message.id
+                            
+                            message_data = self._process_message(
+                                message, channel_username, media_queue, scraped_at
+                            )
+                            if message_data:
+                                message_count += 1
+                                if message_data.get("has_image"):
+                                    image_count += 1
+                                
+                                yield message_data
+                        
+                    break
+                    
+                except FloodWaitError as e:
+                    flood_retries += 1
+                    if flood_retries > MAX_FLOOD_WAIT_RETRIES:
+                        get_telegram_logger().log_scraping_error(channel_username, e, "rate_limit")
+                        raise
+                    
+                    self._record_flood_wait(channel_username, e)
+                    
+                except (ChannelPrivateError, ChatAdminRequiredError) as e:
+                    get_telegram_logger().log_scraping_error(channel_username, e, "access_denied")
+                    raise
+                    
+                except (ChannelInvalidError, ValueError) as e:
+                    # A stale cached peer (e.g. after an account change) is re-resolved
+                    # once; retries resume after the last message seen
+                    if not self._forget_input_peer(channel_username):
+                        get_telegram_logger().log_scraping_error(channel_username, e, "message_scraping")
+                        raise
+                    
+                except Exception as e:
+                    get_telegram_logger().log_scraping_error(channel_username, e, "message_scraping")
+                    raise
             
-        except FloodWaitError as e:
-            telegram_logger.log_rate_limit(channel_username, e.seconds)
-            await asyncio.sleep(e.seconds)
-            # Retry the operation
-            async for message_data in self.scrape_messages(channel_username, limit, offset_date):
-                yield message_data
-                
-        except (ChannelPrivateError, ChatAdminRequiredError) as e:
-            telegram_logger.log_scraping_error(channel_username, e, "access_denied")
-            raise
+            # Let queued downloads finish before reporting the channel as done
+            await media_queue.join()
+        finally:
+            for worker in media_workers:
+                worker.cancel()
             
-        except Exception as e:
-            telegram_logger.log_scraping_error(channel_username, e, "message_scraping")
-            raise
+            # One summary record per channel instead of one per downloaded file
+            if downloaded or failed:
+                get_telegram_logger().log_image_batch(channel_username, downloaded, failed)
+        
+        get_telegram_logger().log_scraping_success(channel_username, message_count, image_count)
+        get_scraping_metrics().update_channel_metrics(channel_username, message_count, image_count)
+    
+    def _record_flood_wait(self, channel_username: str, error: FloodWaitError):
+        """Log a flood wait and hold this client's requests until it, plus jitter, has passed."""
+        get_telegram_logger().log_rate_limit(channel_username, error.seconds)
+        resume_at = time.monotonic() + error.seconds + random.uniform(0, FLOOD_WAIT_JITTER_SECONDS)
+        self._flood_wait_until = max(self._flood_wait_until, resume_at)
+    
+    async def _wait_out_flood(self):
+        """Sleep until any flood wait reported on this client has passed."""
+        delay = self._flood_wait_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
     
-    async def _process_message(self, message: Message, channel_username: str) -> Optional[Dict[str, Any]]:
-        """Process a single Telegram message and extract relevant data."""
+    def _process_message(
+        self, 
+        message: Message, 
+        channel_username: str, 
+        media_queue: asyncio.Queue, 
+        scraped_at: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Process a single Telegram message and extract relevant data.
+        
+        Media is not downloaded inline: a job is queued for the media workers and
+        the path it will be saved to is recorded on the message straight away.
+        
+        Args:
+            message: Telegram message to process
+            channel_username: Username of the channel the message belongs to
+            media_queue: Queue the message's media download job is put on
+            scraped_at: ISO timestamp shared by the current page of messages
+        """
         try:
-            # Basic message data
+            media = message.media
+            reply_to = message.reply_to
+            
+            # Basic message data, built in one literal from attributes read once
             message_data = {
                 "message_id": message.id,
                 "channel_username": channel_username,
                 "date": message.date.isoformat() if message.date else None,
-                "text": message.text if message.text else "",
+                "text": message.text or "",
                 "has_image": False,
                 "has_document": False,
                 "image_paths": [],
                 "document_paths": [],
                 "forward_from": None,
-                "reply_to": message.reply_to.reply_to_msg_id if message.reply_to else None,
+                "reply_to": reply_to.reply_to_msg_id if reply_to else None,
                 "views": getattr(message, 'views', None),
                 "forwards": getattr(message, 'forwards', None),
-                "reactions": [],
-                "entities": [],
-                "scraped_at": datetime.now().isoformat()
+                # Reactions and entities (mentions, hashtags, links, etc.)
+                "reactions": self._extract_reactions(message),
+                "entities": self._extract_entities(message.entities),
+                "scraped_at": scraped_at
             }
             
-            # Extract entities (mentions, hashtags, links, etc.)
-            if message.entities:
-                for entity in message.entities:
-                    entity_data = {
-                        "type": type(entity).__name__,
-                        "offset": entity.offset,
-                        "length": entity.length
-                    }
-                    if hasattr(entity, 'url'):
-                        entity_data["url"] = entity.url
-                    message_data["entities"].append(entity_data)
-            
-            # Extract reactions
-            if hasattr(message, 'reactions') and message.reactions:
-                for reaction in message.reactions.results:
-                    reaction_data = {
-                        "emoji": reaction.reaction.emoji if hasattr(reaction.reaction, 'emoji') else None,
-                        "count": reaction.count
-                    }
-                    message_data["reactions"].append(reaction_data)
-            
-            # Handle media (images and documents)
-            if message.media:
-                if isinstance(message.media, MessageMediaPhoto):
-                    message_data["has_image"] = True
-                    image_path = await self._download_media(message, channel_username, "image")
-                    if image_path:
-                        message_data["image_paths"].append(image_path)
-                
-                elif isinstance(message.media, MessageMediaDocument):
-                    message_data["has_document"] = True
-                    doc_path = await self._download_media(message, channel_username, "document")
-                    if doc_path:
-                        message_data["document_paths"].append(doc_path)
+            # Handle media (images and documents) with one exact-type lookup
+            handler = _MEDIA_HANDLERS.get(media.__class__) if media else None
+            if handler:
+                media_type, flag_key, paths_key = handler
+                media_path = self._media_path(message, channel_username, media_type)
+                media_queue.put_nowait((message, channel_username, media_type, media_path))
+                message_data[flag_key] = True
+                message_data[paths_key].append(str(media_path))
             
             # Handle forwarded messages
-            if message.forward:
+            forward = message.forward
+            if forward:
                 message_data["forward_from"] = {
-                    "chat_id": message.forward.chat_id if message.forward.chat_id else None,
-                    "user_id": message.forward.user_id if message.forward.user_id else None,
-                    "date": message.forward.date.isoformat() if message.forward.date else None
+                    "chat_id": forward.chat_id or None,
+                    "user_id": forward.user_id or None,
+                    "date": forward.date.isoformat() if forward.date else None
                 }
             
             return message_data
             
         except Exception as e:
-            telegram_logger.log_scraping_error(channel_username, e, "message_processing")
+            get_telegram_logger().log_scraping_error(channel_username, e, "message_processing")
             return None
     
+    @staticmethod
+    def _extract_entities(entities) -> List[Dict[str, Any]]:
+        """Flatten message entities to type/offset/length (plus url for links)."""
+        if not entities:
+            return []
+        
+        extracted = []
+        for entity in entities:
+            entity_data = {
+                "type": entity.__class__.__name__,
+                "offset": entity.offset,
+                "length": entity.length
+            }
+            url = getattr(entity, 'url', _MISSING)
+            if url is not _MISSING:
+                entity_data["url"] = url
+            extracted.append(entity_data)
+        return extracted
+    
+    @staticmethod
+    def _extract_reactions(message: Message) -> List[Dict[str, Any]]:
+        """Flatten a message's reaction counts to emoji/count pairs."""
+        reactions = getattr(message, 'reactions', None)
+        if not reactions:
+            return []
+        return [
+            {"emoji": getattr(reaction.reaction, 'emoji', None), "count": reaction.count}
+            for reaction in reactions.results
+        ]
+    
+    def _media_path(self, message: Message, channel_username: str, media_type: str) -> str:
+        """Build (and create the directory for) the file path a message's media is saved to."""
+        date_str = (message.date or datetime.now()).date().isoformat()
+        
+        # Each directory is built and created once, then reused as a plain string
+        key = (media_type, date_str, channel_username)
+        media_dir = self._media_dirs.get(key)
+        if media_dir is None:
+            media_dir = os.path.join(self.raw_dir, f"telegram_{media_type}s", date_str, channel_username)
+            os.makedirs(media_dir, exist_ok=True)
+            self._media_dirs[key] = media_dir
+        
+        # Include the extension up front so Telethon saves to exactly this path
+        return f"{media_dir}{os.sep}{message.id}_{media_type}{get_extension(message.media)}"
+    
+    async def _media_worker(self, media_queue: asyncio.Queue, downloaded: List[str], failed: List[str]):
+        """Download queued media jobs until cancelled, recording each message id's outcome."""
+        while True:
+            message, channel_username, media_type, file_path = await media_queue.get()
+            try:
+                async with self._download_semaphore:
+                    downloaded_path = await self._download_media(message, channel_username, media_type, file_path)
+                (downloaded if downloaded_path else failed).append(str(message.id))
+            finally:
+                media_queue.task_done()
+    
+    @staticmethod
+    def _fits_in_memory(message: Message) -> bool:
+        """Whether a message's media is small enough to buffer in memory."""
+        if isinstance(message.media, MessageMediaPhoto):
+            return True
+        size = getattr(getattr(message.media, 'document', None), 'size', None)
+        return size is not None and size <= IN_MEMORY_DOWNLOAD_LIMIT
+    
     async def _download_media(
         self, 
         message: Message, 
         channel_username: str, 
-        media_type: str
+        media_type: str, 
+        file_path: str
     ) -> Optional[str]:
         """Download media from a message."""
         try:
-            # Create directory structure
-            date_str = message.date.strftime("%Y-%m-%d") if message.date else datetime.now().strftime("%Y-%m-%d")
-            media_dir = Path(settings.storage.data_dir) / "raw" / f"telegram_{media_type}s" / date_str / channel_username
-            media_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Download the media
-            file_path = await self.client.download_media(
-                message.media,
-                file=str(media_dir / f"{message.id}_{media_type}")
-            )
-            
-            if file_path:
-                telegram_logger.log_image_download(channel_username, str(message.id), True, file_path)
-                return str(file_path)
+            if self._fits_in_memory(message):
+                # Fetch into memory and write on a worker thread, so the disk
+                # write doesn't block the event loop alongside other downloads
+                data = await self.client.download_media(message.media, file=bytes)
+                downloaded_path = None
+                if data:
+                    await asyncio.to_thread(self._write_file, file_path, data)
+                    downloaded_path = file_path
             else:
-                telegram_logger.log_image_download(channel_username, str(message.id), False)
-                return None
+                # Large documents are fetched as parallel ranges straight to disk
+                downloaded_path = await self._download_in_parts(message.media, file_path)
+            
+            return str(downloaded_path) if downloaded_path else None
                 
         except Exception as e:
-            telegram_logger.log_scraping_error(channel_username, e, "media_download")
+            get_telegram_logger().log_scraping_error(channel_username, e, "media_download")
             return None
     
+    @staticmethod
+    def _write_file(file_path: str, data: bytes):
+        """Write a downloaded file in one go; run via asyncio.to_thread."""
+        with open(file_path, 'wb') as f:
+            f.write(data)
+    
+    async def _download_in_parts(self, media: MessageMediaDocument, file_path: str) -> str:
+        """
+        Download a document as PARALLEL_DOWNLOAD_PARTS concurrent byte ranges.
+        
+        Each range is an iter_download over request-size-aligned offsets, and its
+        chunks are written into a preallocated file with os.pwrite.
+        """
+        size = media.document.size
+        total_chunks = -(-size // DOWNLOAD_REQUEST_SIZE)
+        chunks_per_part = -(-total_chunks // PARALLEL_DOWNLOAD_PARTS)
+        loop = asyncio.get_running_loop()
+        
+        # A write already on a worker thread can't be interrupted, so writes are
+        # shielded from cancellation and awaited before the fd is closed
+        writes: Set[asyncio.Future] = set()
+        
+        async def fetch_range(fd: int, first_chunk: int):
+            offset = first_chunk * DOWNLOAD_REQUEST_SIZE
+            async for chunk in self.client.iter_download(
+                media,
+                offset=offset,
+                limit=chunks_per_part,
+                request_size=DOWNLOAD_REQUEST_SIZE,
+                file_size=size
+            ):
+                write = loop.run_in_executor(None, os.pwrite, fd, chunk, offset)
+                writes.add(write)
+                write.add_done_callback(writes.discard)
+                await asyncio.shield(write)
+                offset += len(chunk)
+        
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            # A failed range cancels the others, and the group waits for them to stop
+            async with asyncio.TaskGroup() as tg:
+                for first_chunk in range(0, total_chunks, chunks_per_part):
+                    tg.create_task(fetch_range(fd, first_chunk))
+        except BaseException:
+            if writes:
+                await asyncio.wait(writes)
+            # Don't leave a preallocated file that looks complete
+            os.close(fd)
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(file_path)
+            raise
+        os.close(fd)
+        return file_path
+    
     async def get_channel_messages_count(self, channel_username: str) -> int:
         """Get the total number of messages in a channel."""
         try:
-            entity = await self.client.get_entity(channel_username)
+            entity = await self._get_input_entity(channel_username)
             return await self.client.get_messages(entity, limit=0)
         except Exception as e:
-            telegram_logger.log_scraping_error(channel_username, e, "get_message_count")
+            get_telegram_logger().log_scraping_error(channel_username, e, "get_message_count")
             return 0
 
 
@@ -270,6 +611,37 @@ async def create_telegram_client() -> TelegramClientService:
     return TelegramClientService()
 
 
+# Process-wide client, so repeated scrapes share one connection and handshake
+_shared_client: Optional[TelegramClientService] = None
+
+
+async def get_shared_client() -> TelegramClientService:
+    """Return the shared Telegram client service, connecting it on first use."""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = TelegramClientService()
+    try:
+        await _shared_client.ensure_connected()
+    except BaseException:
+        # Don't leave a half-connected client behind for the next caller
+        await close_shared_client()
+        raise
+    return _shared_client
+
+
+async def close_shared_client():
+    """
+    Disconnect the shared Telegram client service, if one was opened.
+    
+    Its connection, lock and semaphores are bound to the running event loop, so
+    call this before that loop finishes; a later asyncio.run() then starts afresh.
+    """
+    global _shared_client
+    client, _shared_client = _shared_client, None
+    if client is not None:
+        await client.disconnect()
+
+
 if __name__ == "__main__":
     # Test the client
     async def test_client():
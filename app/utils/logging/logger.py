@@ -3,38 +3,108 @@ Logging configuration for Ethiopian Medical Business Data Platform.
 Provides structured logging for Telegram scraping operations.
 """
 
+import atexit
 import logging
+import mmap
 import sys
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
+from functools import cache
 from pathlib import Path
-from typing import Optional, Dict, Any
-import json
+from typing import Optional, Dict, Any, List, Tuple
+import orjson
 from loguru import logger
 import os
 
 from config import settings
 
+try:
+    from prometheus_client import Counter, start_http_server
+except ImportError:  # prometheus_client is optional; metrics are still kept on disk
+    Counter = start_http_server = None
+
+
+# Write buffers for the log file sinks, so small records reach the kernel in bulk
+LOG_FILE_BUFFER_SIZE = 64 * 1024
+SCRAPING_LOG_BUFFER_SIZE = 128 * 1024
+
+# Minimum seconds between metrics flushes; pending updates are flushed at exit
+METRICS_FLUSH_INTERVAL = 5.0
+
+# Write buffer for the metrics event log, so update lines are written in bulk
+METRICS_LOG_BUFFER_SIZE = 64 * 1024
+
+# Event log size past which it is folded into the snapshot file
+METRICS_LOG_COMPACT_SIZE = 5 * 1024 * 1024
+
+# In-process Prometheus counters, incremented alongside the metrics file when enabled
+if Counter is not None and settings.prometheus_enabled:
+    SCRAPED_MESSAGES = Counter("scrape_messages_total", "Telegram messages scraped", ["channel"])
+    SCRAPED_IMAGES = Counter("scrape_images_total", "Telegram images scraped", ["channel"])
+else:
+    SCRAPED_MESSAGES = SCRAPED_IMAGES = None
+
+
+# Directory for the scraping log and metrics files
+LOGS_DIR = Path(settings.storage.logs_dir)
+
+
+@cache
+def _ensure_logs_dir() -> Path:
+    """Create the logs directory, once per process, and return it."""
+    LOGS_DIR.mkdir(parents=True, exist_ok=True)
+    return LOGS_DIR
+
+
+def _is_scraping_record(record: Dict[str, Any]) -> bool:
+    """Sink filter for records logged through TelegramScrapingLogger's bound loggers."""
+    # loguru's dict filters match module names, not extras, so this stays a callable;
+    # loguru only calls it for records that already passed the sink's level
+    return "telegram_scraping" in record["extra"]
+
 
 class TelegramScrapingLogger:
-    """Specialized logger for Telegram scraping operations."""
+    """
+    Specialized logger for Telegram scraping operations.
+    
+    Messages are passed to loguru as templates plus arguments, so the string is
+    only formatted once a record passes the level check.
+    """
     
     def __init__(self, log_file: Optional[str] = None):
         self.log_file = log_file or settings.logging.file
         self.setup_logger()
+        
+        # Bound loggers per (channel, operation), so the extra dict is built once per pair
+        self._bound_loggers: Dict[Tuple[str, str], Any] = {}
     
     def setup_logger(self):
-        """Configure the logger with appropriate handlers and formatting."""
+        """
+        Configure the logger with appropriate handlers and formatting.
+        
+        Every sink is enqueued: the record is still formatted in the calling
+        thread, but only the sink write is queued and a background thread does
+        the I/O, so logging from the scrape loop never blocks the event loop on
+        a file write. File sinks are opened with large write buffers; loguru
+        closes (and so flushes) them at exit.
+        """
         # Remove default handler
         logger.remove()
         
-        # Console handler with color
+        # Console handler with color. No diagnose: tracebacks would print local
+        # variable values (bot token included) and cost extra formatting per error
         logger.add(
             sys.stdout,
             format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
             level=settings.logging.level,
-            colorize=True
+            colorize=True,
+            diagnose=False,
+            enqueue=True
         )
         
+        # File sinks use plain format strings (loguru compiles them once, at add time)
+        # and skip colorizing and variable-level exception diagnosis per record
+        
         # File handler for all logs
         logger.add(
             self.log_file,
@@ -42,12 +112,15 @@ class TelegramScrapingLogger:
             level="DEBUG",
             rotation="10 MB",
             retention="30 days",
-            compression="zip"
+            compression="zip",
+            colorize=False,
+            diagnose=False,
+            enqueue=True,
+            buffering=LOG_FILE_BUFFER_SIZE
         )
         
         # Special file for scraping operations
-        scraping_log_file = Path(settings.storage.logs_dir) / "telegram_scraping.log"
-        scraping_log_file.parent.mkdir(parents=True, exist_ok=True)
+        scraping_log_file = _ensure_logs_dir() / "telegram_scraping.log"
         
         logger.add(
             scraping_log_file,
@@ -56,151 +129,364 @@ class TelegramScrapingLogger:
             rotation="50 MB",
             retention="90 days",
             compression="zip",
-            filter=lambda record: "telegram_scraping" in record["extra"]
+            filter=_is_scraping_record,
+            colorize=False,
+            diagnose=False,
+            enqueue=True,
+            buffering=SCRAPING_LOG_BUFFER_SIZE
         )
     
+    def _bound(self, channel: str, operation: str):
+        """Get the scraping logger bound to a channel and operation."""
+        key = (channel, operation)
+        bound = self._bound_loggers.get(key)
+        if bound is None:
+            bound = self._bound_loggers[key] = logger.bind(
+                telegram_scraping=True,
+                channel=channel,
+                operation=operation
+            )
+        return bound
+    
     def log_scraping_start(self, channel: str, operation: str = "scraping"):
         """Log the start of a scraping operation."""
-        logger.bind(
-            telegram_scraping=True,
-            channel=channel,
-            operation=operation
-        ).info(f"Starting {operation} for channel: {channel}")
+        self._bound(channel, operation).info("Starting {} for channel: {}", operation, channel)
     
     def log_scraping_success(self, channel: str, message_count: int, image_count: int = 0):
         """Log successful scraping operation."""
-        logger.bind(
-            telegram_scraping=True,
-            channel=channel,
-            operation="scraping"
-        ).info(f"Successfully scraped {message_count} messages and {image_count} images from {channel}")
-    
-    def log_scraping_error(self, channel: str, error: Exception, operation: str = "scraping"):
-        """Log scraping errors."""
-        logger.bind(
-            telegram_scraping=True,
-            channel=channel,
-            operation=operation
-        ).error(f"Error during {operation} for {channel}: {str(error)}")
+        self._bound(channel, "scraping").info(
+            "Successfully scraped {} messages and {} images from {}", message_count, image_count, channel
+        )
+    
+    def log_scraping_error(
+        self, 
+        channel: str, 
+        error: Exception, 
+        operation: str = "scraping", 
+        file_path: Optional[str] = None
+    ):
+        """
+        Log scraping errors, attaching the exception's traceback to the record.
+        
+        Args:
+            channel: Channel (or component) the error belongs to
+            error: The exception raised
+            operation: Fixed operation name; bound loggers are cached per operation
+            file_path: File the operation was working on, if any (goes in the message)
+        """
+        bound = self._bound(channel, operation).opt(exception=error)
+        if file_path is None:
+            bound.error("Error during {} for {}", operation, channel)
+        else:
+            bound.error("Error during {} for {} on {}", operation, channel, file_path)
     
     def log_rate_limit(self, channel: str, retry_after: int):
         """Log rate limiting events."""
-        logger.bind(
-            telegram_scraping=True,
-            channel=channel,
-            operation="rate_limit"
-        ).warning(f"Rate limited for {channel}, retry after {retry_after} seconds")
+        self._bound(channel, "rate_limit").warning("Rate limited for {}, retry after {} seconds", channel, retry_after)
     
     def log_data_saved(self, channel: str, file_path: str, record_count: int):
         """Log when data is saved to the data lake."""
-        logger.bind(
-            telegram_scraping=True,
-            channel=channel,
-            operation="data_save"
-        ).info(f"Saved {record_count} records to {file_path} for {channel}")
+        self._bound(channel, "data_save").info("Saved {} records to {} for {}", record_count, file_path, channel)
     
     def log_image_download(self, channel: str, image_id: str, success: bool, file_path: Optional[str] = None):
-        """Log image download operations."""
+        """Log a single image download (debug level; scrapes log per-channel batches)."""
         operation = "image_download"
         if success:
-            logger.bind(
-                telegram_scraping=True,
-                channel=channel,
-                operation=operation
-            ).info(f"Downloaded image {image_id} to {file_path} from {channel}")
+            self._bound(channel, operation).debug("Downloaded image {} to {} from {}", image_id, file_path, channel)
         else:
-            logger.bind(
-                telegram_scraping=True,
-                channel=channel,
-                operation=operation
-            ).error(f"Failed to download image {image_id} from {channel}")
+            self._bound(channel, operation).error("Failed to download image {} from {}", image_id, channel)
+    
+    def log_image_batch(self, channel: str, successes: List[str], failures: List[str]):
+        """Log the outcome of a channel's media downloads as at most two records."""
+        operation = "image_download"
+        self._bound(channel, operation).info(
+            "Downloaded {} of {} media files from {}", len(successes), len(successes) + len(failures), channel
+        )
+        if failures:
+            self._bound(channel, operation).error(
+                "Failed to download media for messages {} from {}", ", ".join(failures), channel
+            )
 
 
 class ScrapingMetrics:
-    """Track scraping metrics and statistics."""
+    """
+    Track scraping metrics and statistics.
+    
+    Updates are appended to a JSONL event log (scraping_metrics.jsonl); the JSON
+    snapshot (scraping_metrics.json) is only rewritten when the log is compacted.
+    Loading replays the log on top of the snapshot.
+    """
     
     def __init__(self):
-        self.metrics_file = Path(settings.storage.logs_dir) / "scraping_metrics.json"
-        self.metrics_file.parent.mkdir(parents=True, exist_ok=True)
+        logs_dir = _ensure_logs_dir()
+        self.metrics_file = logs_dir / "scraping_metrics.json"
+        self.metrics_log_file = logs_dir / "scraping_metrics.jsonl"
         self.metrics = self.load_metrics()
+        
+        # Running per-channel totals, so summaries don't rescan every scraped day
+        self._totals: Dict[str, Dict[str, Any]] = {
+            channel: self._sum_channel(channel_metrics)
+            for channel, channel_metrics in self.metrics.items()
+        }
+        
+        # Event lines go through a buffered append handle and reach disk on flush()
+        self._log = open(self.metrics_log_file, 'ab', buffering=METRICS_LOG_BUFFER_SIZE)
+        self._end_torn_line()
+        
+        # Updates are coalesced in memory and written at most every METRICS_FLUSH_INTERVAL
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        
+        # Local date string for updates, recomputed only once the day rolls over
+        self._today = ""
+        self._today_until = 0.0
     
     def load_metrics(self) -> Dict[str, Any]:
-        """Load existing metrics from file."""
+        """Load the metrics snapshot and replay update events logged since."""
+        metrics = {}
         if self.metrics_file.exists():
             try:
-                with open(self.metrics_file, 'r') as f:
-                    return json.load(f)
+                metrics = self._load_json_file(self.metrics_file)
+                
+                # last_scraped is kept as an epoch timestamp; older files stored ISO strings
+                for channel_metrics in metrics.values():
+                    for day_metrics in channel_metrics.values():
+                        day_metrics["last_scraped"] = self._to_epoch(day_metrics.get("last_scraped"))
             except Exception as e:
                 logger.error(f"Failed to load metrics: {e}")
+        
+        if self.metrics_log_file.exists():
+            try:
+                with open(self.metrics_log_file, 'rb') as f:
+                    for line in f:
+                        try:
+                            event = orjson.loads(line)
+                        except ValueError:
+                            # Skip a torn last line from an interrupted write
+                            continue
+                        self._apply_update(
+                            metrics, 
+                            event["channel"], 
+                            event["date"], 
+                            event["messages"], 
+                            event["images"], 
+                            self._to_epoch(event["ts"])
+                        )
+            except Exception as e:
+                logger.error(f"Failed to replay metrics log: {e}")
+        return metrics
+    
+    def _end_torn_line(self):
+        """
+        Terminate a torn last line left by an interrupted write.
+        
+        Otherwise the next event would be appended onto the fragment, and replay
+        would skip the merged line, losing that event along with it.
+        """
+        end = self._log.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        
+        with open(self.metrics_log_file, 'rb') as f:
+            f.seek(end - 1)
+            if f.read(1) != b"\n":
+                self._log.write(b"\n")
+    
+    @staticmethod
+    def _load_json_file(file_path: Path) -> Any:
+        """Parse a JSON file from a read-only memory map instead of reading it into bytes first."""
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
                 return {}
-        return {}
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
     
-    def save_metrics(self):
-        """Save metrics to file."""
+    def save_metrics(self) -> bool:
+        """Save a snapshot of all metrics to file, returning whether it was written."""
         try:
-            with open(self.metrics_file, 'w') as f:
-                json.dump(self.metrics, f, indent=2, default=str)
+            # Write a temp file and rename it over the snapshot, so a crash mid-write
+            # never leaves a truncated file behind
+            tmp_file = self.metrics_file.with_suffix(".json.tmp")
+            tmp_file.write_bytes(orjson.dumps(self.metrics, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_file, self.metrics_file)
+            return True
         except Exception as e:
             logger.error(f"Failed to save metrics: {e}")
+            return False
     
-    def update_channel_metrics(self, channel: str, message_count: int, image_count: int = 0):
-        """Update metrics for a specific channel."""
-        today = datetime.now().strftime("%Y-%m-%d")
-        
-        if channel not in self.metrics:
-            self.metrics[channel] = {}
-        
-        if today not in self.metrics[channel]:
-            self.metrics[channel][today] = {
+    def compact(self):
+        """Fold the event log into the snapshot file and truncate the log."""
+        self._log.flush()
+        # The log is the only copy of events since the last snapshot until one is written
+        if self.save_metrics():
+            self._log.truncate(0)
+    
+    def flush(self):
+        """Write pending metric updates to file, if there are any."""
+        if self._dirty:
+            try:
+                self._log.flush()
+                if os.fstat(self._log.fileno()).st_size > METRICS_LOG_COMPACT_SIZE:
+                    self.compact()
+            except Exception as e:
+                logger.error(f"Failed to flush metrics: {e}")
+            self._dirty = False
+        self._last_flush = time.monotonic()
+    
+    def close(self):
+        """Flush pending metric updates and close the event log."""
+        if not self._log.closed:
+            self.flush()
+            self._log.close()
+    
+    @staticmethod
+    def _apply_update(
+        metrics: Dict[str, Any], 
+        channel: str, 
+        day: str, 
+        message_count: int, 
+        image_count: int, 
+        scraped_at: float
+    ):
+        """Add one update event to a channel's per-day metrics."""
+        channel_metrics = metrics.setdefault(channel, {})
+        day_metrics = channel_metrics.get(day)
+        if day_metrics is None:
+            day_metrics = channel_metrics[day] = {
                 "messages": 0,
                 "images": 0,
                 "last_scraped": None,
                 "scraping_count": 0
             }
         
-        self.metrics[channel][today]["messages"] += message_count
-        self.metrics[channel][today]["images"] += image_count
-        self.metrics[channel][today]["last_scraped"] = datetime.now().isoformat()
-        self.metrics[channel][today]["scraping_count"] += 1
+        day_metrics["messages"] += message_count
+        day_metrics["images"] += image_count
+        day_metrics["last_scraped"] = scraped_at
+        day_metrics["scraping_count"] += 1
+    
+    def update_channel_metrics(self, channel: str, message_count: int, image_count: int = 0):
+        """Update metrics for a specific channel."""
+        scraped_at = time.time()
+        today = self._today_for(scraped_at)
+        
+        self._apply_update(self.metrics, channel, today, message_count, image_count, scraped_at)
+        
+        totals = self._totals.get(channel)
+        if totals is None:
+            totals = self._totals[channel] = self._sum_channel({})
+        totals["messages"] += message_count
+        totals["images"] += image_count
+        totals["scrapes"] += 1
+        totals["last_scraped"] = scraped_at
+        
+        if SCRAPED_MESSAGES is not None:
+            SCRAPED_MESSAGES.labels(channel).inc(message_count)
+            SCRAPED_IMAGES.labels(channel).inc(image_count)
         
-        self.save_metrics()
+        # Record the update as one event line instead of rewriting every metric
+        self._log.write(orjson.dumps({
+            "channel": channel,
+            "date": today,
+            "messages": message_count,
+            "images": image_count,
+            "ts": scraped_at
+        }, option=orjson.OPT_APPEND_NEWLINE))
+        
+        self._dirty = True
+        if time.monotonic() - self._last_flush >= METRICS_FLUSH_INTERVAL:
+            self.flush()
+    
+    def _today_for(self, timestamp: float) -> str:
+        """Get the local date string for a timestamp, reusing it until midnight."""
+        if timestamp >= self._today_until:
+            today = datetime.fromtimestamp(timestamp).date()
+            self._today = today.isoformat()
+            self._today_until = datetime.combine(today + timedelta(days=1), datetime.min.time()).timestamp()
+        return self._today
+    
+    @staticmethod
+    def _to_epoch(value: Any) -> Optional[float]:
+        """Normalize a stored last_scraped value (ISO string or epoch) to epoch seconds."""
+        if isinstance(value, str):
+            return datetime.fromisoformat(value).timestamp()
+        return value
+    
+    @staticmethod
+    def _sum_channel(channel_metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """Total a channel's per-day metrics (used once per channel at load)."""
+        return {
+            "messages": sum(day["messages"] for day in channel_metrics.values()),
+            "images": sum(day["images"] for day in channel_metrics.values()),
+            "scrapes": sum(day["scraping_count"] for day in channel_metrics.values()),
+            "last_scraped": max(
+                (day["last_scraped"] for day in channel_metrics.values() if day["last_scraped"]),
+                default=None
+            )
+        }
     
     def get_channel_summary(self, channel: str) -> Dict[str, Any]:
         """Get summary statistics for a channel."""
-        if channel not in self.metrics:
+        totals = self._totals.get(channel)
+        if totals is None:
             return {}
         
-        channel_data = self.metrics[channel]
-        total_messages = sum(day["messages"] for day in channel_data.values())
-        total_images = sum(day["images"] for day in channel_data.values())
-        total_scrapes = sum(day["scraping_count"] for day in channel_data.values())
-        
+        last_scraped = totals["last_scraped"]
         return {
-            "total_messages": total_messages,
-            "total_images": total_images,
-            "total_scrapes": total_scrapes,
-            "days_scraped": len(channel_data),
-            "last_scraped": max(day["last_scraped"] for day in channel_data.values()) if channel_data else None
+            "total_messages": totals["messages"],
+            "total_images": totals["images"],
+            "total_scrapes": totals["scrapes"],
+            "days_scraped": len(self.metrics[channel]),
+            "last_scraped": last_scraped and datetime.fromtimestamp(last_scraped).isoformat()
         }
 
 
-# Global logger instance
-telegram_logger = TelegramScrapingLogger()
-scraping_metrics = ScrapingMetrics()
+# Shared instances are built on first use, so importing this module stays cheap
+@cache
+def get_telegram_logger() -> TelegramScrapingLogger:
+    """Get the shared scraping logger, configuring the log sinks on first use."""
+    return TelegramScrapingLogger()
+
+
+@cache
+def get_scraping_metrics() -> ScrapingMetrics:
+    """Get the shared scraping metrics, loading them from file on first use."""
+    metrics = ScrapingMetrics()
+    # Pending updates are flushed at exit; other instances are closed by their owners
+    atexit.register(metrics.close)
+    return metrics
+
+
+@cache
+def start_metrics_server() -> bool:
+    """
+    Expose the Prometheus counters over HTTP for the life of the process.
+    
+    Only long-running entry points should call this; Prometheus then scrapes
+    /metrics on settings.prometheus_port.
+    
+    Returns:
+        Whether the endpoint is being served
+    """
+    if SCRAPED_MESSAGES is None:
+        return False
+    
+    try:
+        start_http_server(settings.prometheus_port)
+    except OSError as e:
+        logger.warning(f"Could not serve Prometheus metrics on port {settings.prometheus_port}: {e}")
+        return False
+    return True
 
 
 def get_logger(name: str = __name__):
     """Get a logger instance with the specified name."""
+    get_telegram_logger()
     return logger.bind(name=name)
 
 
 def log_scraping_operation(channel: str, operation: str, **kwargs):
     """Convenience function for logging scraping operations."""
-    logger.bind(
-        telegram_scraping=True,
-        channel=channel,
-        operation=operation
-    ).info(f"{operation} for {channel}: {kwargs}")
+    get_telegram_logger()._bound(channel, operation).info("{} for {}: {}", operation, channel, kwargs)
 
 
 if __name__ == "__main__":
@@ -208,9 +494,10 @@ if __name__ == "__main__":
     test_logger = get_logger("test")
     test_logger.info("Testing logging system")
     
+    telegram_logger = get_telegram_logger()
     telegram_logger.log_scraping_start("test_channel")
     telegram_logger.log_scraping_success("test_channel", 100, 5)
     telegram_logger.log_data_saved("test_channel", "/path/to/file.json", 100)
     
-    scraping_metrics.update_channel_metrics("test_channel", 100, 5)
+    get_scraping_metrics().update_channel_metrics("test_channel", 100, 5)
     print("Logging system test completed") 
\ No newline at end of file
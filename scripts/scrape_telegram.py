@@ -10,12 +10,15 @@ import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from loguru import logger
+
 # Add the project root to the Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from app.services.scrapers.telegram_scraper import TelegramScraper
-from app.utils.logging.logger import telegram_logger, scraping_metrics
+from app.services.telegram.client import get_shared_client, close_shared_client
+from app.utils.logging.logger import get_telegram_logger, get_scraping_metrics, start_metrics_server
 from config import settings
 
 
@@ -110,29 +113,35 @@ async def main():
     if args.dry_run:
         print("🔍 Testing Telegram connection...")
         try:
-            from app.services.telegram.client import TelegramClientService
+            client = await get_shared_client()
+            print("✅ Successfully connected to Telegram API")
             
-            async with TelegramClientService() as client:
-                print("✅ Successfully connected to Telegram API")
-                
-                # Test channel access
-                for channel in scraper.channels:
-                    try:
-                        info = await client.get_channel_info(channel)
-                        if info:
-                            print(f"✅ Channel {channel}: {info.get('title', 'Unknown')}")
-                        else:
-                            print(f"❌ Channel {channel}: Could not access")
-                    except Exception as e:
-                        print(f"❌ Channel {channel}: Error - {str(e)}")
+            # Test channel access, checking all channels concurrently
+            infos = await asyncio.gather(
+                *(client.get_channel_info(channel) for channel in scraper.channels),
+                return_exceptions=True
+            )
+            for channel, info in zip(scraper.channels, infos):
+                if isinstance(info, Exception):
+                    print(f"❌ Channel {channel}: Error - {str(info)}")
+                elif info:
+                    print(f"✅ Channel {channel}: {info.get('title', 'Unknown')}")
+                else:
+                    print(f"❌ Channel {channel}: Could not access")
                 
         except Exception as e:
             print(f"❌ Failed to connect to Telegram API: {str(e)}")
             return
+        finally:
+            await close_shared_client()
         
         print("🔍 Dry run completed successfully")
         return
     
+    # Serve the live scrape counters to Prometheus while the scrape runs
+    if start_metrics_server():
+        print(f"📈 Prometheus metrics on port {settings.prometheus_port}")
+    
     # Perform scraping
     try:
         if args.hours_back:
@@ -179,8 +188,15 @@ async def main():
         print("\n⚠️  Scraping interrupted by user")
     except Exception as e:
         print(f"\n❌ Scraping failed: {str(e)}")
-        telegram_logger.log_scraping_error("script", e, "main_scraping")
+        get_telegram_logger().log_scraping_error("script", e, "main_scraping")
         return 1
+    finally:
+        # The scraper shares one Telegram connection for the whole run
+        await close_shared_client()
+        get_scraping_metrics().flush()
+        
+        # Log sinks are enqueued; wait for the writer thread to drain them
+        await logger.complete()
     
     print(f"\n✅ Scraping completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     return 0
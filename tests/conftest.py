@@ -0,0 +1,32 @@
+"""
+Shared pytest setup.
+
+The offline unit tests must be able to import config without a .env file, so
+placeholders are filled in for the required settings (values from the
+environment or .env still win), and logs and data default to a scratch
+directory instead of the container paths.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+load_dotenv(project_root / ".env")
+
+# Required settings with no default; empty Telegram credentials make the live
+# Telegram tests skip themselves
+for name in ("TELEGRAM_API_ID", "TELEGRAM_API_HASH", "TELEGRAM_BOT_TOKEN", "SECRET_KEY", "JWT_SECRET_KEY"):
+    os.environ.setdefault(name, "")
+
+# Scratch directory for logs and data, unless configured
+_scratch_dir = Path(tempfile.mkdtemp(prefix="medigram_tests_"))
+os.environ.setdefault("LOGS_DIR", str(_scratch_dir / "logs"))
+os.environ.setdefault("LOG_FILE", str(_scratch_dir / "logs" / "app.log"))
+os.environ.setdefault("DATA_DIR", str(_scratch_dir / "data"))
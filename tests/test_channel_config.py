@@ -0,0 +1,28 @@
+"""
+Offline tests for the channel configuration getters.
+"""
+
+import json
+
+from app.services.scrapers.channel_config import get_channel_metadata, get_enabled_channels, get_scraping_schedule
+
+
+def test_schedule_and_metadata_are_json_serializable():
+    schedule = json.loads(json.dumps(get_scraping_schedule()))
+    metadata = json.loads(json.dumps(get_channel_metadata()))
+    
+    assert set(schedule) == {channel.username for channel in get_enabled_channels()}
+    assert all("scraping_config" in channel_metadata for channel_metadata in metadata.values())
+
+
+def test_callers_cannot_mutate_the_cached_config():
+    schedule = get_scraping_schedule()
+    username = next(iter(schedule))
+    schedule[username]["scraping_limit"] = 0
+    schedule.pop(username)
+    
+    metadata = get_channel_metadata()
+    metadata[username]["scraping_config"]["limit"] = 0
+    
+    assert get_scraping_schedule()[username]["scraping_limit"] > 0
+    assert get_channel_metadata()[username]["scraping_config"]["limit"] > 0
@@ -0,0 +1,193 @@
+"""
+Offline tests for the data lake manager.
+Each test works on a throwaway data lake under pytest's tmp_path.
+"""
+
+import gzip
+import hashlib
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+import orjson
+import pytest
+
+from app.services.scrapers.data_lake_manager import DataLakeManager, _ScalableBloomFilter
+
+
+PARTITION_DATE = datetime(2024, 1, 1, 12, 0)
+
+
+def make_messages(channel, ids, date="2024-01-01T12:00:00"):
+    """Build minimal message rows as the scraper produces them."""
+    return [
+        {
+            "message_id": message_id,
+            "channel_username": channel,
+            "date": f"{date[:-2]}{message_id % 60:02d}",
+            "text": f"message {message_id}"
+        }
+        for message_id in ids
+    ]
+
+
+@pytest.fixture
+def data_lake(tmp_path):
+    return DataLakeManager(data_dir=tmp_path)
+
+
+def test_bloom_filter_detects_duplicates_across_layers():
+    seen = _ScalableBloomFilter(initial_capacity=64, exact_limit=0)
+    hashes = [hashlib.blake2b(str(i).encode(), digest_size=16).hexdigest() for i in range(500)]
+    
+    assert not any(seen.add(message_hash) for message_hash in hashes)
+    assert len(seen.layers) > 1
+    assert all(seen.add(message_hash) for message_hash in hashes)
+    
+    # Hashes that aren't hex digests are digested first
+    assert not seen.add("not-a-hex-digest")
+    assert seen.add("not-a-hex-digest")
+
+
+def test_bloom_filter_keeps_small_histories_exact():
+    seen = _ScalableBloomFilter(exact_limit=100)
+    hashes = [hashlib.blake2b(str(i).encode(), digest_size=16).hexdigest() for i in range(150)]
+    
+    assert not any(seen.add(message_hash) for message_hash in hashes[:100])
+    assert seen.layers == []
+    
+    # Past the limit the hashes seen so far move into a Bloom layer
+    assert not any(seen.add(message_hash) for message_hash in hashes[100:])
+    assert seen.exact is None
+    assert all(seen.add(message_hash) for message_hash in hashes)
+
+
+def test_save_and_get_latest_messages(data_lake):
+    data_lake.save_messages("chan", make_messages("chan", [1, 2, 3]), PARTITION_DATE)
+    data_lake.save_messages("chan", make_messages("chan", [4, 5]), datetime(2024, 1, 2))
+    
+    latest = data_lake.get_latest_messages("chan", limit=3)
+    
+    assert [message["message_id"] for message in latest] == [5, 4, 3]
+    assert all(message["_metadata"]["channel"] == "chan" for message in latest)
+
+
+def test_save_messages_batch_registers_files_in_manifest(data_lake):
+    file_paths = data_lake.save_messages_batch(
+        {
+            "chan": make_messages("chan", [1, 2]),
+            "other": make_messages("other", [3])
+        },
+        PARTITION_DATE
+    )
+    
+    assert data_lake._get_channel_files("chan")[0] == [Path(file_paths["chan"])]
+    assert data_lake._get_channel_files("other")[0] == [Path(file_paths["other"])]
+    
+    # The first save creates the manifest, which indexes the new file without a
+    # count before the save registers it; re-registering adds to the count
+    data_lake.register_file("chan", "2024-01-01", Path(file_paths["chan"]), 3)
+    (msg_count,) = data_lake._get_manifest().execute(
+        "SELECT msg_count FROM files WHERE path = ?", (file_paths["chan"],)
+    ).fetchone()
+    assert msg_count == 5
+
+
+def test_manifest_indexes_existing_partitions(tmp_path):
+    channel_dir = tmp_path / "raw" / "telegram_messages" / "2024-01-01" / "chan"
+    channel_dir.mkdir(parents=True)
+    legacy_file = channel_dir / "messages_20240101_120000.json"
+    legacy_file.write_bytes(orjson.dumps(make_messages("chan", [1])))
+    
+    assert DataLakeManager(data_dir=tmp_path)._get_channel_files("chan")[0] == [legacy_file]
+
+
+def test_legacy_and_ndjson_files_are_both_read(data_lake):
+    data_lake.save_messages("chan", make_messages("chan", [2]), PARTITION_DATE)
+    legacy_file = data_lake.messages_dir / "2024-01-01" / "chan" / "messages_20240101_000000.json"
+    legacy_file.write_bytes(orjson.dumps(make_messages("chan", [1])))
+    
+    messages = data_lake.get_messages_for_date_range("chan", PARTITION_DATE, PARTITION_DATE)
+    
+    assert sorted(message["message_id"] for message in messages) == [1, 2]
+
+
+def test_torn_gzip_member_is_skipped(data_lake):
+    file_path = Path(data_lake.save_messages("chan", make_messages("chan", [1]), PARTITION_DATE))
+    
+    # A batch cut off mid-write, followed by one appended after the restart
+    torn_member = gzip.compress(b'{"message_id": 99}\n')[:-6]
+    valid_member = gzip.compress(orjson.dumps(make_messages("chan", [2])[0], option=orjson.OPT_APPEND_NEWLINE))
+    with open(file_path, "ab") as f:
+        f.write(torn_member + valid_member)
+    
+    with pytest.raises((OSError, EOFError, zlib.error)):
+        gzip.decompress(file_path.read_bytes())
+    
+    messages = data_lake._parse_messages(file_path, data_lake._read_message_file(file_path))
+    assert [message["message_id"] for message in messages] == [1, 2]
+
+
+def test_stats_cache_skips_unchanged_partitions(data_lake, monkeypatch):
+    data_lake.save_messages("chan", make_messages("chan", [1, 2]), PARTITION_DATE)
+    assert data_lake.get_data_lake_stats()["total_messages"] == 2
+    
+    # Unchanged partitions come from the cache without reading any file
+    def fail_read(paths):
+        assert not paths, "unchanged partitions were re-read"
+        return iter(())
+    
+    with monkeypatch.context() as patch:
+        patch.setattr(data_lake, "_read_files", fail_read)
+        assert data_lake.get_data_lake_stats()["total_messages"] == 2
+    
+    # Saving bumps the partition mtime (even when appending), invalidating its entry
+    data_lake.save_messages("chan", make_messages("chan", [3]), PARTITION_DATE)
+    assert data_lake.get_data_lake_stats()["total_messages"] == 3
+    
+    # The cache is persisted for the next process, which loads it on first use
+    next_data_lake = DataLakeManager(data_dir=data_lake.data_dir)
+    assert next_data_lake._partition_cache is None
+    with monkeypatch.context() as patch:
+        patch.setattr(next_data_lake, "_read_files", fail_read)
+        assert next_data_lake.get_data_lake_stats()["total_messages"] == 3
+
+
+def test_validate_data_integrity_counts_duplicates(data_lake):
+    data_lake.save_messages("chan", make_messages("chan", [1, 2]), PARTITION_DATE)
+    data_lake.save_messages("chan", make_messages("chan", [2, 3]), datetime(2024, 1, 2))
+    
+    results = data_lake.validate_data_integrity("chan")
+    
+    assert results["total_files"] == 2
+    assert results["valid_files"] == 2
+    assert results["total_messages"] == 4
+    assert results["duplicate_messages"] == 1
+    assert results["missing_fields"] == []
+
+
+def test_rebuild_manifest_reconciles_files_on_disk(data_lake):
+    stale_file = Path(data_lake.save_messages("chan", make_messages("chan", [1]), PARTITION_DATE))
+    stale_file.unlink()
+    
+    # A file written without going through the manifest
+    channel_dir = data_lake.messages_dir / "2024-01-02" / "chan"
+    channel_dir.mkdir(parents=True)
+    unregistered_file = channel_dir / "messages_20240102_120000.json"
+    unregistered_file.write_bytes(orjson.dumps(make_messages("chan", [2, 3])))
+    
+    data_lake.rebuild_manifest()
+    results = data_lake.validate_data_integrity("chan")
+    
+    assert results["total_files"] == 1
+    assert results["total_messages"] == 2
+    assert results["errors"] == []
+    assert data_lake._get_channel_files("chan")[0] == [unregistered_file]
+
+
+def test_stats_skip_unreadable_files(data_lake):
+    data_lake.save_messages("chan", make_messages("chan", [1, 2]), PARTITION_DATE)
+    broken_file = data_lake.messages_dir / "2024-01-01" / "chan" / "messages_20240101_000000.json"
+    broken_file.write_bytes(b'[{"message_id": 1')
+    
+    assert data_lake.get_data_lake_stats()["total_messages"] == 2
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Tests for Telegram scraping functionality.
+Verifies that the scraping system works correctly with the configured channels.
+
+Run with pytest (one Telegram connection is shared by the whole session), or
+directly with `python tests/test_scraping.py` for a summary report.
+"""
+
+import asyncio
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pytest
+import pytest_asyncio
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional (and unavailable on Windows); asyncio's own loop is used
+    uvloop = None
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from telethon.errors import FloodWaitError
+
+from app.services.telegram.client import TelegramClientService, get_shared_client, close_shared_client
+from app.services.scrapers.telegram_scraper import TelegramScraper
+from app.services.scrapers.channel_config import get_channel_usernames, get_enabled_channels, validate_channel_configs
+from app.utils.logging.logger import get_logger
+from config import settings
+
+
+# Per-channel results go through the enqueued log sinks rather than print: records
+# are formatted here, but the stdout write happens on loguru's background thread
+logger = get_logger("test_scraping")
+
+
+# Channels whose access is checked at once (keeps clear of Telegram flood limits)
+MAX_CONCURRENT_CHANNEL_CHECKS = 10
+
+# Channels scraped at once by the message scraping test
+MAX_CONCURRENT_TEST_SCRAPES = 2
+
+# Live Telegram tests only run with real credentials configured (see tests/conftest.py)
+requires_telegram = pytest.mark.skipif(
+    not (settings.telegram.api_id.isdigit() and settings.telegram.bot_token),
+    reason="TELEGRAM_API_ID and TELEGRAM_BOT_TOKEN are not configured"
+)
+
+# Channel info from the access test, by username. Later tests only touch channels
+# found here; the shared client already caches their resolved entities.
+_channel_info_cache: Dict[str, Dict[str, Any]] = {}
+
+
+@dataclass(slots=True, frozen=True)
+class ChannelScrapeResult:
+    """Outcome of the message scraping test for one channel."""
+    
+    success: bool
+    messages_scraped: int = 0
+    sample_message: Optional[Dict[str, Any]] = None  # id, date and text preview only
+    error: Optional[str] = None
+
+
+class ConnectionFailed(Exception):
+    """Raised in main() when the Telegram connection check fails, cancelling the other checks."""
+
+
+async def check_telegram_connection() -> Optional[TelegramClientService]:
+    """Test basic Telegram API connection, returning the client shared by later tests."""
+    print("🔍 Testing Telegram API connection...")
+    
+    try:
+        client = await get_shared_client()
+        me = await client.client.get_me()
+        print(f"✅ Connected successfully as: {me.first_name} (@{me.username})")
+        
+        # Resolve every enabled channel up front, concurrently, so the later checks
+        # hit the client's entity cache instead of each issuing their own resolves
+        await client.warm_entity_cache(get_channel_usernames())
+        return client
+    except Exception as e:
+        print(f"❌ Connection failed: {str(e)}")
+        return None
+
+
+async def check_channel_access(client: TelegramClientService):
+    """Test access to configured channels."""
+    print("\n🔍 Testing channel access...")
+    
+    channels = get_enabled_channels()
+    accessible_channels = []
+    
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_CHANNEL_CHECKS)
+    
+    async def check(channel):
+        async with semaphore:
+            return await client.get_channel_info(channel.username)
+    
+    # Check every channel concurrently, then report in configuration order
+    infos = await asyncio.gather(*(check(channel) for channel in channels), return_exceptions=True)
+    
+    for channel, info in zip(channels, infos):
+        if isinstance(info, Exception):
+            logger.error("❌ {}: Error: {}", channel.username, info)
+        elif info:
+            logger.info("✅ {}: Accessible: {}", channel.username, info.get('title', 'Unknown'))
+            accessible_channels.append(channel.username)
+            _channel_info_cache[channel.username] = info
+        else:
+            logger.warning("❌ {}: Not accessible", channel.username)
+    
+    # Let the queued records reach the console before the summary line
+    await logger.complete()
+    print(f"\n📊 Channel access summary: {len(accessible_channels)}/{len(channels)} channels accessible")
+    return accessible_channels
+
+
+async def _scrape_one(
+    client: TelegramClientService, 
+    channel, 
+    limit: int, 
+    semaphore: asyncio.Semaphore
+) -> ChannelScrapeResult:
+    """Scrape a few messages from one channel for the message scraping test."""
+    async with semaphore:
+        try:
+            # scrape_messages already stops at `limit`; draining it (rather than breaking
+            # out early) also lets it finish queued media downloads and record metrics.
+            # Only a few fields of the first message are kept, not the rows themselves.
+            message_count = 0
+            sample_message = None
+            async for message in client.scrape_messages(channel.username, limit=limit):
+                if sample_message is None:
+                    sample_message = {
+                        "id": message["message_id"],
+                        "date": str(message["date"]),
+                        "preview": message["text"][:120]
+                    }
+                message_count += 1
+            
+            logger.info("✅ {}: scraped {} messages", channel.username, message_count)
+            return ChannelScrapeResult(True, message_count, sample_message)
+            
+        except FloodWaitError as e:
+            # scrape_messages already waited out (with jitter) and retried every flood
+            # wait it could, so stop here rather than spend more of the account's budget
+            logger.error("❌ {}: Rate limited for {} seconds", channel.username, e.seconds)
+            return ChannelScrapeResult(False, error=f"Rate limited for {e.seconds} seconds")
+            
+        except Exception as e:
+            logger.error("❌ {}: Error: {}", channel.username, e)
+            return ChannelScrapeResult(False, error=str(e))
+
+
+async def check_message_scraping(client: TelegramClientService, limit: int = 5) -> Dict[str, ChannelScrapeResult]:
+    """Test message scraping with a small limit."""
+    print(f"\n🔍 Testing message scraping (limit: {limit})...")
+    
+    # Test the first 2 channels that passed the access test (all enabled ones if it hasn't run)
+    channels = [
+        channel for channel in get_enabled_channels()
+        if not _channel_info_cache or channel.username in _channel_info_cache
+    ][:2]
+    
+    # Channels are scraped concurrently; flood waits are handled inside scrape_messages
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_TEST_SCRAPES)
+    print(f"  Scraping {', '.join(channel.username for channel in channels)}...")
+    channel_results = await asyncio.gather(
+        *(_scrape_one(client, channel, limit, semaphore) for channel in channels)
+    )
+    await logger.complete()
+    
+    return {channel.username: result for channel, result in zip(channels, channel_results)}
+
+
+async def check_data_lake_storage():
+    """Test data lake storage functionality."""
+    print("\n🔍 Testing data lake storage...")
+    
+    from app.services.scrapers.data_lake_manager import DataLakeManager
+    
+    # A throwaway data lake, so the round trip neither touches nor pollutes the real one
+    data_lake_dir = tempfile.TemporaryDirectory(prefix="data_lake_test_", ignore_cleanup_errors=True)
+    data_lake_manager = DataLakeManager(data_dir=Path(data_lake_dir.name))
+    
+    # Test saving sample data for a couple of channels in one batch
+    sample_messages = {
+        channel: [
+            {
+                "message_id": 12345,
+                "channel_username": channel,
+                "date": "2024-01-01T12:00:00",
+                "text": "Test message for data lake",
+                "has_image": False,
+                "has_document": False
+            }
+        ]
+        for channel in ("test_channel", "test_channel_2")
+    }
+    
+    try:
+        # File I/O runs on a thread so this test can overlap with the Telegram tests
+        file_paths = await asyncio.to_thread(data_lake_manager.save_messages_batch, sample_messages)
+        for file_path in file_paths.values():
+            print(f"✅ Sample data saved to: {file_path}")
+        
+        # Test retrieving data
+        messages = await asyncio.to_thread(data_lake_manager.get_latest_messages, "test_channel", limit=10)
+        print(f"✅ Retrieved {len(messages)} messages from data lake")
+        
+        # The lake starts empty, so exactly the saved sample should come back
+        return len(messages) == len(sample_messages["test_channel"])
+        
+    except Exception as e:
+        print(f"❌ Data lake test failed: {str(e)}")
+        return False
+        
+    finally:
+        data_lake_dir.cleanup()
+
+
+async def check_full_scraping_pipeline(client: TelegramClientService):
+    """Test the complete scraping pipeline."""
+    print("\n🔍 Testing complete scraping pipeline...")
+    
+    try:
+        # Reuse the connection and the channel info already fetched by the earlier tests
+        scraper = TelegramScraper(client=client, channel_info_cache=_channel_info_cache)
+        
+        # Test with very small limits for testing
+        results = await scraper.scrape_single_channel("telegram", limit=3)
+        
+        if results.get("success"):
+            print(f"✅ Pipeline test successful: {results['messages_scraped']} messages scraped")
+            return True
+        else:
+            print(f"❌ Pipeline test failed: {results.get('error')}")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Pipeline test failed: {str(e)}")
+        return False
+
+
+def check_configuration():
+    """Test channel configuration."""
+    print("\n🔍 Testing channel configuration...")
+    
+    # Validate configurations
+    validation = validate_channel_configs()
+    
+    if validation["errors"]:
+        print("❌ Configuration errors found:")
+        for error in validation["errors"]:
+            print(f"  - {error}")
+    else:
+        print("✅ No configuration errors found")
+    
+    if validation["warnings"]:
+        print("⚠️  Configuration warnings:")
+        for warning in validation["warnings"]:
+            print(f"  - {warning}")
+    
+    print(f"📊 Configuration summary:")
+    print(f"  - Total channels: {validation['total_channels']}")
+    print(f"  - Enabled channels: {validation['enabled_channels']}")
+    print(f"  - Categories: {validation['categories']}")
+    print(f"  - Priorities: {validation['priorities']}")
+    
+    return len(validation["errors"]) == 0
+
+
+# pytest entry points: the checks above, against one client shared by the session
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """Session-wide event loop (uvloop when installed), so tg_client can span every test."""
+    loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def tg_client():
+    """The shared Telegram client, connected once for the whole session."""
+    client = await check_telegram_connection()
+    if client is None:
+        pytest.fail("Cannot run Telegram tests without a Telegram connection")
+    yield client
+    await close_shared_client()
+
+
+def test_configuration():
+    assert check_configuration()
+
+
+@requires_telegram
+@pytest.mark.asyncio
+async def test_telegram_connection(tg_client):
+    assert await tg_client.client.get_me()
+
+
+@requires_telegram
+@pytest.mark.asyncio
+async def test_channel_access(tg_client):
+    assert await check_channel_access(tg_client)
+
+
+@requires_telegram
+@pytest.mark.asyncio
+async def test_message_scraping(tg_client):
+    scraping_results = await check_message_scraping(tg_client, limit=3)
+    assert any(result.success for result in scraping_results.values())
+
+
+@pytest.mark.asyncio
+async def test_data_lake_storage():
+    assert await check_data_lake_storage()
+
+
+@requires_telegram
+@pytest.mark.asyncio
+async def test_full_scraping_pipeline(tg_client):
+    assert await check_full_scraping_pipeline(tg_client)
+
+
+async def main():
+    """Run all tests."""
+    print("🧪 Telegram Scraping System Test Suite")
+    print("=" * 50)
+    
+    test_results = {
+        "configuration": False,
+        "connection": False,
+        "channel_access": False,
+        "message_scraping": False,
+        "data_lake": False,
+        "pipeline": False
+    }
+    
+    # Concurrent tests run in one task group: if any test raises (or the connection
+    # fails), the others are cancelled and the shared client is closed straight away
+    try:
+        async with asyncio.TaskGroup() as tg:
+            # The finally also covers a failed connection check, which can still
+            # leave a half-opened shared client behind
+            try:
+                # Test 1: Configuration, on a thread so it overlaps the Telegram handshake below
+                print("\n1️⃣ Testing Configuration...")
+                config_task = tg.create_task(asyncio.to_thread(check_configuration))
+                
+                # Test 2: Telegram Connection (one connection is shared by all remaining tests)
+                print("\n2️⃣ Testing Telegram Connection...")
+                client = await check_telegram_connection()
+                test_results["connection"] = client is not None
+                
+                if not test_results["connection"]:
+                    raise ConnectionFailed()
+                
+                # Test 3: Channel Access, with Test 5: Data Lake Storage running alongside it
+                # (it doesn't touch Telegram, so it needn't wait for the scraping tests)
+                print("\n3️⃣ Testing Channel Access (5️⃣ Data Lake Storage runs concurrently)...")
+                data_lake_task = tg.create_task(check_data_lake_storage())
+                accessible_channels = await check_channel_access(client)
+                test_results["channel_access"] = len(accessible_channels) > 0
+                
+                # Test 4: Message Scraping (only channels found accessible; it shares the
+                # flood-limit budget with Test 6, so the two stay sequential)
+                print("\n4️⃣ Testing Message Scraping...")
+                scraping_results = await check_message_scraping(client, limit=3)
+                test_results["message_scraping"] = any(result.success for result in scraping_results.values())
+                
+                # Test 6: Full Pipeline
+                print("\n6️⃣ Testing Full Pipeline...")
+                test_results["pipeline"] = await check_full_scraping_pipeline(client)
+            finally:
+                await close_shared_client()
+    except* ConnectionFailed:
+        print("❌ Cannot proceed with other tests without Telegram connection")
+    
+    if not test_results["connection"]:
+        return False
+    
+    test_results["configuration"] = config_task.result()
+    test_results["data_lake"] = data_lake_task.result()
+    
+    # Summary
+    print("\n" + "=" * 50)
+    print("📊 Test Results Summary:")
+    print("=" * 50)
+    
+    for test_name, result in test_results.items():
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{test_name.replace('_', ' ').title()}: {status}")
+    
+    passed_tests = sum(test_results.values())
+    total_tests = len(test_results)
+    
+    print(f"\nOverall: {passed_tests}/{total_tests} tests passed")
+    
+    if passed_tests == total_tests:
+        print("🎉 All tests passed! The scraping system is ready to use.")
+    else:
+        print("⚠️  Some tests failed. Please check the configuration and try again.")
+    
+    return passed_tests == total_tests
+
+
+if __name__ == "__main__":
+    # Run the test suite, on uvloop's libuv-based event loop when it's installed
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop if uvloop else None) as runner:
+        success = runner.run(main())
+    sys.exit(0 if success else 1) 
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""
+Offline tests for scraping metrics persistence.
+Metrics files are written under pytest's tmp_path.
+"""
+
+import pytest
+
+from app.utils.logging import logger as logger_module
+from app.utils.logging.logger import ScrapingMetrics
+
+
+@pytest.fixture
+def metrics_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(logger_module, "_ensure_logs_dir", lambda: tmp_path)
+    return tmp_path
+
+
+def test_updates_are_replayed_from_the_event_log(metrics_dir):
+    metrics = ScrapingMetrics()
+    metrics.update_channel_metrics("chan", 10, 2)
+    metrics.update_channel_metrics("chan", 5)
+    metrics.close()
+    
+    assert metrics._log.closed
+    assert not metrics.metrics_file.exists()
+    
+    summary = ScrapingMetrics().get_channel_summary("chan")
+    assert summary["total_messages"] == 15
+    assert summary["total_images"] == 2
+    assert summary["total_scrapes"] == 2
+    assert summary["days_scraped"] == 1
+
+
+def test_torn_event_line_is_skipped(metrics_dir):
+    metrics = ScrapingMetrics()
+    metrics.update_channel_metrics("chan", 10)
+    metrics.flush()
+    with open(metrics.metrics_log_file, "ab") as f:
+        f.write(b'{"channel": "chan", "da')
+    
+    metrics = ScrapingMetrics()
+    assert metrics.get_channel_summary("chan")["total_messages"] == 10
+    
+    # Events logged after the torn line still replay
+    metrics.update_channel_metrics("chan", 5)
+    metrics.flush()
+    assert ScrapingMetrics().get_channel_summary("chan")["total_messages"] == 15
+
+
+def test_compact_folds_the_log_into_the_snapshot(metrics_dir):
+    metrics = ScrapingMetrics()
+    metrics.update_channel_metrics("chan", 10, 1)
+    metrics.compact()
+    
+    assert metrics.metrics_file.exists()
+    assert metrics.metrics_log_file.stat().st_size == 0
+    
+    metrics.update_channel_metrics("chan", 4)
+    metrics.flush()
+    
+    summary = ScrapingMetrics().get_channel_summary("chan")
+    assert summary["total_messages"] == 14
+    assert summary["total_images"] == 1
+    assert summary["total_scrapes"] == 2
+
+
+def test_compact_keeps_the_log_when_the_snapshot_fails(metrics_dir, monkeypatch):
+    metrics = ScrapingMetrics()
+    metrics.update_channel_metrics("chan", 10)
+    monkeypatch.setattr(metrics, "save_metrics", lambda: False)
+    metrics.compact()
+    
+    assert metrics.metrics_log_file.stat().st_size > 0
+    assert ScrapingMetrics().get_channel_summary("chan")["total_messages"] == 10
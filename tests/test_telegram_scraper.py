@@ -0,0 +1,39 @@
+"""
+Offline tests for the scraper's resume state.
+The state file is written under pytest's tmp_path.
+"""
+
+import pytest
+
+from app.services.scrapers.telegram_scraper import TelegramScraper
+
+
+@pytest.fixture
+def scraper(tmp_path):
+    scraper = TelegramScraper()
+    scraper.scrape_state_file = tmp_path / "scrape_state.json"
+    return scraper
+
+
+def test_scrape_state_round_trip(scraper):
+    assert scraper._load_scrape_state() == {}
+    
+    scraper._save_scrape_state({
+        "chan": {"success": True, "last_message_id": 42},
+        "failed": {"success": False, "error": "boom"}
+    })
+    
+    assert scraper._load_scrape_state() == {"chan": 42}
+
+
+def test_scrape_state_only_moves_forward(scraper):
+    scraper._save_scrape_state({"chan": {"last_message_id": 42}})
+    scraper._save_scrape_state({"chan": {"last_message_id": 7}, "other": {"last_message_id": 3}})
+    
+    assert scraper._load_scrape_state() == {"chan": 42, "other": 3}
+
+
+def test_corrupt_scrape_state_starts_over(scraper):
+    scraper.scrape_state_file.write_bytes(b'{"chan": 4')
+    
+    assert scraper._load_scrape_state() == {}